@@ -156,7 +156,7 @@ if __name__ == "__main__":
         event_map = collect_event_map(src_bnk, dst_bnk, src_ids, dst_ids)
 
     try:
-        copy_wwise_events(src_bnk, dst_bnk, event_map)
+        copy_wwise_events(src_bnk, dst_bnk, event_map, verify=True)
     except Exception:
         if hasattr(sys, "gettrace") and sys.gettrace() is not None:
             # Debugger is active, let the debugger handle it
@@ -3,7 +3,7 @@ __version__ = "0.2.0"
 
 from .node import Node
 from .soundbank import Soundbank
-from .hash import calc_hash, lookup_name
+from .hash import calc_hash, lookup_name, lookup_hash
 from . import convenience
 from . import transfer
 from . import wem
@@ -61,8 +61,11 @@ def create_simple_sound(
     if isinstance(wems, Path):
         wems = [wems]
 
+    # Draw all IDs at once so they can't collide with each other
+    rsc_id, play_id, stop_id, *sound_ids = bnk.new_ids(3 + len(wems))
+
     rsc = RandomSequenceContainer.new(
-        bnk.new_id(),
+        rsc_id,
         avoid_repeats=avoid_repeats,
         loop_count=1,
         parent=actor_mixer,
@@ -72,18 +75,17 @@ def create_simple_sound(
             rsc.set_property(key, val)
     rsc.avoid_repeats = avoid_repeats
 
-    sounds = []
-    for w in wems:
-        snd = Sound.new_from_wem(bnk.new_id(), w, parent=rsc)
-        rsc.add_child(snd)
-        sounds.append(snd)
+    sounds = [
+        Sound.new_from_wem(sid, w, parent=rsc) for sid, w in zip(sound_ids, wems)
+    ]
+    rsc.add_children(sounds)
 
     play = Event.new(f"Play_{event_name}")
-    play_action = Action.new_play_action(bnk.new_id(), rsc.id)
+    play_action = Action.new_play_action(play_id, rsc.id)
     play.add_action(play_action)
 
     stop = Event.new(f"Stop_{event_name}")
-    stop_action = Action.new_stop_action(bnk.new_id(), rsc.id)
+    stop_action = Action.new_stop_action(stop_id, rsc.id)
     stop.add_action(stop_action)
 
     # Add the RSC to the actor mixer
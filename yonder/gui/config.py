@@ -5,7 +5,7 @@ import inspect
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 
-from yonder.hash import global_hash_dict, load_lookup_table
+from yonder.hash import add_lookup_table, load_lookup_table
 from yonder.util import logger
 from yonder.gui.dialogs.file_dialog import open_file_dialog
 
@@ -92,7 +92,7 @@ class Config:
             if not path.is_file():
                 logger.warning(f"Hash dict not found: {path}")
             else:
-                global_hash_dict.update(load_lookup_table(path))
+                add_lookup_table(load_lookup_table(path))
 
     def find_external_sounds(self, source_id: int, bnk: "Soundbank" = None) -> Generator[Path, None, None]:
         bnkdirs = list(self.bankdirs)
@@ -71,7 +71,7 @@ def new_wwise_event_dialog(
             show_message("No events created")
             return
 
-        bnk.add_nodes(new_nodes)
+        bnk.add_nodes(*new_nodes)
 
         callback(new_nodes)
         show_message("Yay!", color=style.blue)
@@ -27,6 +27,10 @@ def select_nodes_dialog(
     row_tags: dict[int, str] = {}
     selected_keys: set[str] = set()
 
+    # Rows which already received their details tooltip
+    rows_with_details: set[int] = set()
+    row_handlers = f"{tag}_row_handlers"
+
     def _set_row_highlight(row_tag: int, selected: bool) -> None:
         dpg.highlight_table_row(
             f"{tag}_table",
@@ -37,6 +41,7 @@ def select_nodes_dialog(
     def _rebuild_table() -> None:
         row_tags.clear()
         selected_keys.clear()
+        rows_with_details.clear()
 
         # Remove all existing rows
         for child in dpg.get_item_children(f"{tag}_table", slot=1) or []:
@@ -45,7 +50,7 @@ def select_nodes_dialog(
         for key, node in items.items():
             with dpg.table_row(parent=f"{tag}_table") as row:
                 row_tags[row] = key
-                dpg.add_selectable(
+                selectable = dpg.add_selectable(
                     label=key,
                     span_columns=True,
                     callback=_on_row_clicked,
@@ -53,11 +58,24 @@ def select_nodes_dialog(
                 )
 
             if get_node_details:
-                details = get_node_details(node)
-                if details:
-                    with dpg.tooltip(dpg.last_item()):
-                        for line in details:
-                            dpg.add_text(line)
+                # Details are only collected once the user hovers over a row
+                dpg.bind_item_handler_registry(selectable, row_handlers)
+
+    def _on_row_hovered(sender: int, selectable: int, _user_data: Any) -> None:
+        row = dpg.get_item_user_data(selectable)
+        if row in rows_with_details:
+            return
+
+        rows_with_details.add(row)
+        key = row_tags.get(row)
+        if key is None:
+            return
+
+        details = get_node_details(items[key])
+        if details:
+            with dpg.tooltip(selectable):
+                for line in details:
+                    dpg.add_text(line)
 
     def _on_row_clicked(sender: int, value: bool, row_tag: int) -> None:
         key = row_tags.get(row_tag)
@@ -103,7 +121,19 @@ def select_nodes_dialog(
             key = next(iter(selected_keys), None)
             on_nodes_selected(tag, items[key], user_data)
 
+        close()
+
+    def close() -> None:
         dpg.delete_item(window)
+        if dpg.does_item_exist(row_handlers):
+            dpg.delete_item(row_handlers)
+
+    if get_node_details:
+        if dpg.does_item_exist(row_handlers):
+            dpg.delete_item(row_handlers)
+
+        with dpg.item_handler_registry(tag=row_handlers):
+            dpg.add_item_hover_handler(callback=_on_row_hovered)
 
     with dpg.window(
         label=title,
@@ -112,7 +142,7 @@ def select_nodes_dialog(
         autosize=True,
         no_saved_settings=True,
         tag=tag,
-        on_close=lambda: dpg.delete_item(window),
+        on_close=close,
     ) as window:
         dpg.add_input_text(
             callback=on_filter_changed,
@@ -146,7 +176,7 @@ def select_nodes_dialog(
             dpg.add_button(label="Okay", callback=on_okay, tag=f"{tag}_button_okay")
             dpg.add_button(
                 label="Cancel",
-                callback=lambda: dpg.delete_item(window),
+                callback=close,
             )
 
     on_filter_changed(f"{tag}_filter", "", None)
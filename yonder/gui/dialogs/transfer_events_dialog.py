@@ -1,13 +1,15 @@
 from typing import Any
 from pathlib import Path
+from concurrent.futures import Future
 from dearpygui import dearpygui as dpg
 
 from yonder import Soundbank
 from yonder.node_types import Event
 from yonder.transfer import copy_wwise_events
-from yonder.hash import calc_hash
+from yonder.hash import calc_hash, calc_hash_bulk
 from yonder.gui import style
-from yonder.gui.widgets import add_generic_widget
+from yonder.gui.helpers import run_in_background
+from yonder.gui.widgets import add_generic_widget, loading_indicator
 from .select_nodes_dialog import select_nodes_of_type
 
 
@@ -21,22 +23,41 @@ def transfer_events_dialog(
     elif dpg.does_item_exist(tag):
         dpg.delete_item(tag)
 
-    src_bnk: Soundbank = None
-    dst_bnk: Soundbank = None
+    # Soundbanks are loaded in the background while the user fills in the rest
+    src_bnk_future: Future[Soundbank] = None
+    dst_bnk_future: Future[Soundbank] = None
 
     def on_source_bnk_selected(sender: str, path: Path, user_data: Any) -> None:
-        nonlocal src_bnk
-        src_bnk = Soundbank.load(path)
+        nonlocal src_bnk_future
+        src_bnk_future = run_in_background(Soundbank.load, path)
 
     def on_dest_bnk_selected(sender: str, path: Path, user_data: Any) -> None:
-        nonlocal dst_bnk
-        dst_bnk = Soundbank.load(path)
+        nonlocal dst_bnk_future
+        dst_bnk_future = run_in_background(Soundbank.load, path)
+
+    def get_soundbank(future: Future[Soundbank]) -> Soundbank:
+        if not future.done():
+            loading = loading_indicator("Loading soundbank...")
+            try:
+                future.exception()
+            finally:
+                dpg.delete_item(loading)
+
+        if future.exception():
+            show_message(f"Failed to load soundbank: {future.exception()}")
+            return None
+
+        return future.result()
 
     def select_nodes() -> None:
-        if not src_bnk:
+        if not src_bnk_future:
             show_message("Select source bank first")
             return
 
+        src_bnk = get_soundbank(src_bnk_future)
+        if not src_bnk:
+            return
+
         select_nodes_of_type(src_bnk, Event, on_nodes_selected, multiple=True)
 
     def on_nodes_selected(sender: str, nodes: list[Event], user_data: Any) -> None:
@@ -67,18 +88,33 @@ def transfer_events_dialog(
             line = "Play_" + line
         return calc_hash(line)
 
-    def prune_ids(ids: list[str]) -> list[str]:
+    def parse_ids(lines: list[str]) -> list[tuple[str, int]]:
+        lines = [line.strip() for line in lines]
+        lines = [line for line in lines if line]
+
+        # Hash all names in one go
+        names = [
+            line if line.startswith(("Play_", "Stop_")) else "Play_" + line
+            for line in lines
+            if not line.startswith("#")
+        ]
+        name_hashes = iter(calc_hash_bulk(names))
+
         # NOTE it's important to maintain the order
-        pruned = []
+        parsed = []
         seen = set()
 
-        for line in ids:
-            h = line_to_hash(line)
-            if h is not None and h not in seen:
+        for line in lines:
+            if line.startswith("#"):
+                h = int(line[1:])
+            else:
+                h = next(name_hashes)
+
+            if h not in seen:
                 seen.add(h)
-                pruned.append(line)
+                parsed.append((line, h))
 
-        return pruned
+        return parsed
 
     def show_message(msg: str, color: tuple[int, int, int, int] = style.red) -> None:
         if not msg:
@@ -93,16 +129,21 @@ def transfer_events_dialog(
         )
 
     def on_okay() -> None:
-        if not src_bnk:
+        if not src_bnk_future:
             show_message("No source bank selected")
             return
 
-        if not dst_bnk:
+        if not dst_bnk_future:
             show_message("No destination bank selected")
             return
 
-        src_ids = prune_ids(dpg.get_value(f"{tag}_source_ids").splitlines())
-        dst_ids = prune_ids(dpg.get_value(f"{tag}_dest_ids").splitlines())
+        src_bnk = get_soundbank(src_bnk_future)
+        dst_bnk = get_soundbank(dst_bnk_future)
+        if not src_bnk or not dst_bnk:
+            return
+
+        src_ids = parse_ids(dpg.get_value(f"{tag}_source_ids").splitlines())
+        dst_ids = parse_ids(dpg.get_value(f"{tag}_dest_ids").splitlines())
 
         if not src_ids:
             show_message("No source IDs selected")
@@ -112,24 +153,22 @@ def transfer_events_dialog(
             show_message("Source and destination IDs not balanced")
             return
 
-        for line in src_ids:
-            src_play_id = line_to_hash(line)
+        for line, src_play_id in src_ids:
             if src_play_id not in src_bnk:
                 show_message(f"{line} not found in source bank")
                 return
 
-        for line in dst_ids:
+        for line, dst_play_id in dst_ids:
             if line.startswith("#"):
                 show_message("Destination IDs cannot be hashes")
                 return
 
-            dst_play_id = line_to_hash(line)
             if dst_play_id in dst_bnk:
                 show_message(f"{line} already exists in destination bank")
                 return
 
         event_map = {}
-        for sid, did in zip(src_ids, dst_ids):
+        for (sid, src_hash), (did, _) in zip(src_ids, dst_ids):
             src_explicit = sid.startswith(("Play_", "Stop_", "#"))
             dst_explicit = did.startswith(("Play_", "Stop_"))
             if src_explicit != dst_explicit:
@@ -137,13 +176,13 @@ def transfer_events_dialog(
                 return
 
             if src_explicit:
-                event_map[line_to_hash(sid)] = did
+                event_map[src_hash] = did
             else:
-                play_evt = f"Play_{sid}"
-                if play_evt in src_bnk:
-                    event_map[play_evt] = f"Play_{did}"
+                # Implicit names have been hashed as their play event
+                if src_hash in src_bnk:
+                    event_map[src_hash] = f"Play_{did}"
 
-                stop_evt = f"Stop_{sid}"
+                stop_evt = calc_hash(f"Stop_{sid}")
                 if stop_evt in src_bnk:
                     event_map[stop_evt] = f"Stop_{did}"
 
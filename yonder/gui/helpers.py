@@ -1,4 +1,6 @@
+from typing import Any, Callable
 from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
 import tempfile
 import atexit
 from dearpygui import dearpygui as dpg
@@ -12,6 +14,14 @@ tmp_dir = tempfile.TemporaryDirectory(prefix="yonder_")
 atexit.register(tmp_dir.cleanup)
 logger.info(f"Temporary files will be stored in {tmp_dir}")
 
+# Shared by all dialogs for loading/saving soundbanks without blocking their callbacks
+background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="yonder")
+atexit.register(background_executor.shutdown, wait=False, cancel_futures=True)
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    return background_executor.submit(func, *args, **kwargs)
+
 
 def estimate_drawn_text_size(
     textlen: int,
@@ -22,6 +22,10 @@ light_green = (112, 255, 162, 255)
 light_red = (255, 112, 119)
 
 
+disabled_text = (168, 168, 168)
+disabled_button = (96, 96, 96)
+
+
 class themes:
     notification_frame = None
     item_default = None
@@ -32,6 +36,15 @@ class themes:
     plot_red = None
 
 
+def add_disabled_theme_component(widget_type: int) -> int:
+    """Add a theme component greying out the specified widget type when disabled."""
+    with dpg.theme_component(widget_type, enabled_state=False) as component:
+        dpg.add_theme_color(dpg.mvThemeCol_Text, disabled_text)
+        dpg.add_theme_color(dpg.mvThemeCol_Button, disabled_button)
+
+    return component
+
+
 def init_themes():
     # Global theme
     bg_elements = [
@@ -76,21 +89,13 @@ def init_themes():
                     dpg.add_theme_color(elem, shade, category=dpg.mvThemeCat_Core)
 
         # Disabled components
-        with dpg.theme_component(dpg.mvInputFloat, enabled_state=False):
-            dpg.add_theme_color(dpg.mvThemeCol_Text, [168, 168, 168])
-            dpg.add_theme_color(dpg.mvThemeCol_Button, [96, 96, 96])
-
-        with dpg.theme_component(dpg.mvInputInt, enabled_state=False):
-            dpg.add_theme_color(dpg.mvThemeCol_Text, [168, 168, 168])
-            dpg.add_theme_color(dpg.mvThemeCol_Button, [96, 96, 96])
-
-        with dpg.theme_component(dpg.mvInputText, enabled_state=False):
-            dpg.add_theme_color(dpg.mvThemeCol_Text, [168, 168, 168])
-            dpg.add_theme_color(dpg.mvThemeCol_Button, [96, 96, 96])
-
-        with dpg.theme_component(dpg.mvCheckbox, enabled_state=False):
-            dpg.add_theme_color(dpg.mvThemeCol_Text, [168, 168, 168])
-            dpg.add_theme_color(dpg.mvThemeCol_Button, [96, 96, 96])
+        for widget_type in (
+            dpg.mvInputFloat,
+            dpg.mvInputInt,
+            dpg.mvInputText,
+            dpg.mvCheckbox,
+        ):
+            add_disabled_theme_component(widget_type)
 
     dpg.bind_theme(global_theme)
 
@@ -11,6 +11,7 @@ from .table_tree_nodes import (
     table_tree_node,
     table_tree_leaf,
     add_lazy_table_tree_node,
+    clear_table_tree,
     set_foldable_row_status,
     is_foldable_row_expanded,
     get_foldable_row_descriptor,
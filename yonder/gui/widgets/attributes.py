@@ -60,8 +60,7 @@ def create_attribute_widgets(
             if key not in new_props:
                 node.remove_property(key)
 
-        for key, val in new_props.items():
-            node.set_property(key, val)
+        node.set_properties(new_props)
 
         on_node_changed(tag, node, user_data)
 
@@ -1,4 +1,4 @@
-from typing import Generator, Callable, Any
+from typing import Generator, Iterator, Callable, Any
 from contextlib import contextmanager
 from dataclasses import dataclass
 import dearpygui.dearpygui as dpg
@@ -8,6 +8,77 @@ INDENT_STEP = 14  # actually depends on font size
 
 
 @dataclass
+class TableState:
+    cur_level: int = 0
+
+
+# Nesting state of the table_tree_node contexts currently open per table. Kept on the
+# python side so we don't have to go through the table's user data for every row
+_table_state: dict[int, TableState] = {}
+
+# Mirrors the order of each table's rows so we don't have to retrieve (and copy) all
+# rows from dpg every time we need to look at a row's surroundings
+_row_order: dict[int, list[int]] = {}
+
+
+def _get_table_key(table: int | str) -> int:
+    if isinstance(table, str):
+        return dpg.get_alias_id(table)
+    return table
+
+
+def _get_table_rows(table: int | str) -> list[int]:
+    key = _get_table_key(table)
+    rows = _row_order.get(key)
+    if rows is None:
+        rows = _row_order[key] = dpg.get_item_children(table, slot=1)
+
+    return rows
+
+
+def _register_row(table: int | str, row: int | str, before: int | str = 0) -> None:
+    rows = _get_table_rows(table)
+
+    if isinstance(row, str):
+        row = dpg.get_alias_id(row)
+    if isinstance(before, str):
+        before = dpg.get_alias_id(before)
+
+    if before in (None, 0):
+        rows.append(row)
+    else:
+        rows.insert(rows.index(before), row)
+
+
+def clear_table_tree(table: int | str) -> None:
+    """Delete all rows of a table containing table tree nodes."""
+    dpg.delete_item(table, children_only=True, slot=1)
+    _row_order.pop(_get_table_key(table), None)
+
+
+def _get_cur_level(table: int | str) -> int:
+    state = _table_state.get(_get_table_key(table))
+    return state.cur_level if state else 0
+
+
+@contextmanager
+def _enter_table_level(table: int | str) -> Generator[None, None, None]:
+    key = _get_table_key(table)
+    state = _table_state.get(key)
+    if state is None:
+        state = _table_state[key] = TableState()
+
+    state.cur_level += 1
+    try:
+        yield
+    finally:
+        state.cur_level -= 1
+        if state.cur_level == 0:
+            # Outermost node closed, nothing left to track
+            _table_state.pop(key, None)
+
+
+@dataclass(slots=True)
 class RowDescriptor:
     level: int
     row: str = None
@@ -15,6 +86,7 @@ class RowDescriptor:
     selectable: str = None
     button: str = None
     is_lazy: bool = False
+    applied_indent: int = -1
     on_fold_cb: Callable[[str, bool, Any], None] = None
     on_click_cb: Callable[[str, bool, Any], None] = None
     user_data: Any = None
@@ -56,12 +128,14 @@ def get_row_level(row: str, default: int = 0) -> int:
 
 
 def is_row_index_visible(table, row_level: int, row_idx: int = -1) -> bool:
-    rows = dpg.get_item_children(table, slot=1)
+    get_desc = get_foldable_row_descriptor
+
+    rows = _get_table_rows(table)
     if row_idx >= 0:
         rows = rows[:row_idx]
 
     for parent in reversed(rows):
-        desc = get_foldable_row_descriptor(parent)
+        desc = get_desc(parent)
         if not desc:
             return True
 
@@ -76,7 +150,7 @@ def is_row_visible(table: str, row: str | int) -> bool:
         return True
 
     desc = get_foldable_row_descriptor(row)
-    rows = dpg.get_item_children(table, slot=1)
+    rows = _get_table_rows(table)
     row_idx = rows.index(row)
     return is_row_index_visible(table, desc.level, row_idx)
 
@@ -88,14 +162,15 @@ def get_foldable_child_rows(table: str, row: int | str) -> Generator[str, None,
     if isinstance(row, str):
         row = dpg.get_alias_id(row)
 
-    rows = dpg.get_item_children(table, slot=1)
+    rows = _get_table_rows(table)
     row_idx = rows.index(row)
 
     if row_idx >= 0:
         rows = rows[row_idx + 1:]
 
+    is_foldable = is_foldable_row
     for child_row in rows:
-        if not is_foldable_row(child_row):
+        if not is_foldable(child_row):
             break
 
         yield child_row
@@ -105,7 +180,7 @@ def get_foldable_row_parent(table: str, row: int | str) -> int:
     if isinstance(row, str):
         row = dpg.get_alias_id(row)
 
-    rows = dpg.get_item_children(table, slot=1)
+    rows = _get_table_rows(table)
     row_idx = rows.index(row)
 
     if row_idx > 0:
@@ -123,7 +198,7 @@ def get_next_foldable_row_sibling(table: str, row: str) -> int:
         row = dpg.get_alias_id(row)
 
     row_level = get_row_level(row)
-    rows = dpg.get_item_children(table, slot=1)
+    rows = _get_table_rows(table)
     row_idx = rows.index(row)
 
     if row_idx >= 0:
@@ -136,6 +211,23 @@ def get_next_foldable_row_sibling(table: str, row: str) -> int:
     return 0
 
 
+def _iter_rows_until_sibling(table: str, row: int | str) -> Iterator[int]:
+    """Yield all rows below the specified row until the next row on the same or a higher level."""
+    if isinstance(row, str):
+        row = dpg.get_alias_id(row)
+
+    row_level = get_row_level(row)
+    rows = _get_table_rows(table)
+    row_idx = rows.index(row)
+
+    for child_row in rows[row_idx + 1 :]:
+        desc = get_foldable_row_descriptor(child_row)
+        if not desc or desc.level <= row_level:
+            break
+
+        yield child_row
+
+
 def get_row_indent(table: str, row: str) -> int:
     parent = get_foldable_row_parent(table, row)
     if not parent:
@@ -159,20 +251,30 @@ def apply_row_indent(
         if isinstance(until, str):
             until = dpg.get_alias_id(until)
 
+        get_desc = get_foldable_row_descriptor
+        get_item_children = dpg.get_item_children
+        set_item_indent = dpg.set_item_indent
+
         for child_row in children:
             if until != 0 and child_row == until:
                 break
 
-            desc = get_foldable_row_descriptor(child_row)
+            desc = get_desc(child_row)
             if desc:
                 child_level = desc.level + indent_level
                 desc.level = child_level
             else:
                 child_level = indent_level
 
-            child_row_content = dpg.get_item_children(child_row, slot=1)
+            indent = child_level * INDENT_STEP
+            if desc and desc.applied_indent == indent:
+                continue
+
+            child_row_content = get_item_children(child_row, slot=1)
             if child_row_content:
-                dpg.set_item_indent(child_row_content[0], child_level * INDENT_STEP)
+                set_item_indent(child_row_content[0], indent)
+                if desc:
+                    desc.applied_indent = indent
 
 
 def set_foldable_row_status(row: str, expanded: bool) -> None:
@@ -212,7 +314,7 @@ def table_tree_node(
     if tag in (0, "", None):
         tag = dpg.generate_uuid()
 
-    cur_level = dpg.get_item_user_data(table) or 0
+    cur_level = _get_cur_level(table)
     button = f"{tag}_foldable_row_button"
     selectable = f"{tag}_foldable_row_selectable"
     show = is_row_index_visible(table, cur_level)
@@ -223,6 +325,7 @@ def table_tree_node(
         table=table,
         button=button,
         selectable=selectable,
+        applied_indent=cur_level * INDENT_STEP,
         on_fold_cb=on_fold_callback,
         on_click_cb=on_click_callback,
         user_data=user_data,
@@ -249,11 +352,13 @@ def table_tree_node(
                 tag=selectable,
                 user_data=user_data,
             )
+
+    _register_row(table, tag, before)
+
     try:
-        dpg.set_item_user_data(table, cur_level + 1)
-        yield descriptor
+        with _enter_table_level(table):
+            yield descriptor
     finally:
-        dpg.set_item_user_data(table, cur_level)
         set_foldable_row_status(tag, not folded)
 
 @contextmanager
@@ -268,7 +373,7 @@ def table_tree_leaf(
     if tag in (0, "", None):
         tag = dpg.generate_uuid()
 
-    cur_level = dpg.get_item_user_data(table) or 0
+    cur_level = _get_cur_level(table)
     row = f"{tag}_foldable_row"
     show = is_row_index_visible(table, cur_level)
 
@@ -282,11 +387,13 @@ def table_tree_leaf(
             user_data=descriptor,
             show=show,
         ):
+            _register_row(table, tag, before)
             yield descriptor
     finally:
         children = dpg.get_item_children(row, slot=1)
         if children:
             dpg.set_item_indent(children[0], cur_level * INDENT_STEP)
+            descriptor.applied_indent = cur_level * INDENT_STEP
 
 
 def add_lazy_table_tree_node(
@@ -305,7 +412,7 @@ def add_lazy_table_tree_node(
     if tag in (0, "", None):
         tag = dpg.generate_uuid()
 
-    cur_level = dpg.get_item_user_data(table) or 0
+    cur_level = _get_cur_level(table)
     button = f"{tag}_foldable_row_button"
     selectable = f"{tag}_foldable_row_selectable"
     show = is_row_index_visible(table, cur_level)
@@ -317,6 +424,7 @@ def add_lazy_table_tree_node(
         button=button,
         selectable=selectable,
         is_lazy=True,
+        applied_indent=cur_level * INDENT_STEP,
         on_fold_cb=content_callback,
         user_data=user_data,
     )
@@ -343,33 +451,42 @@ def add_lazy_table_tree_node(
                 user_data=user_data,
             )
 
+    _register_row(table, tag, before)
+
     return descriptor
 
 
 def _on_row_clicked(sender: str, value: Any, desc: RowDescriptor):
+    row = desc.row
+
+    if desc.button is None:
+        # Leaves have nothing to fold
+        if desc.on_fold_cb:
+            desc.on_fold_cb(row, True, desc.user_data)
+        return
+
     # Make sure it happens quickly and without flickering
     with dpg.mutex():
-        row = desc.row
         table = desc.table
-        is_leaf = desc.button is None
         is_expanded = not is_foldable_row_expanded(row)
 
         # Toggle the node's "expanded" status
-        if not is_leaf:
-            dpg.set_item_label(desc.button, "-" if is_expanded else "+")
+        dpg.set_item_label(desc.button, "-" if is_expanded else "+")
 
         # Call user callback for regular nodes
         if desc.on_fold_cb:
-            desc.on_fold_cb(row, is_leaf or is_expanded, desc.user_data)
+            desc.on_fold_cb(row, is_expanded, desc.user_data)
 
-        if is_leaf:
-            return
+        get_desc = get_foldable_row_descriptor
+        is_row_expanded = is_foldable_row_expanded
+        hide_item = dpg.hide_item
+        show_item = dpg.show_item
 
         # All children *beyond* this level (but not on this level) will be hidden
         hide_level = 10000 if is_expanded else desc.level
 
         for child_row in get_foldable_child_rows(table, row):
-            child_desc = get_foldable_row_descriptor(child_row)
+            child_desc = get_desc(child_row)
             if not child_desc:
                 # Not a foldable row, stop here
                 break
@@ -380,38 +497,37 @@ def _on_row_clicked(sender: str, value: Any, desc: RowDescriptor):
 
             if child_desc.level > hide_level:
                 # Child is too far away, hide it
-                dpg.hide_item(child_row)
+                hide_item(child_row)
             else:
                 # Child is close to one of its siblings, show it
-                dpg.show_item(child_row)
+                show_item(child_row)
                 hide_level = (
-                    10000
-                    if is_foldable_row_expanded(child_row)
-                    else child_desc.level
+                    10000 if is_row_expanded(child_row) else child_desc.level
                 )
 
 
 def _on_lazy_node_clicked(sender: str, app_data: Any, desc: RowDescriptor):
     row = desc.row
     table = desc.table
-    anchor = get_next_foldable_row_sibling(table, row)
-    indent_level = desc.level + 1
     folded = not is_foldable_row_expanded(row)
 
     dpg.set_item_label(desc.button, "-" if folded else "+")
 
     if folded:
+        anchor = get_next_foldable_row_sibling(table, row)
+        indent_level = desc.level + 1
         with apply_row_indent(table, indent_level, row, until=anchor):
             desc.on_fold_cb(sender, anchor, desc.user_data)
     else:
-        child_rows = list(get_foldable_child_rows(table, row))
-
-        until = anchor
-        if isinstance(until, str):
-            until = dpg.get_alias_id(anchor)
-
-        for child_row in child_rows:
-            if until != 0 and child_row == until:
-                break
-
-            dpg.delete_item(child_row)
+        # Rows are siblings within the table, so there is no container we could clear
+        # in one go. Delete them in one batch so we only get a single re-layout
+        with dpg.mutex():
+            num_deleted = 0
+            for child_row in _iter_rows_until_sibling(table, row):
+                dpg.delete_item(child_row)
+                num_deleted += 1
+
+        if num_deleted > 0:
+            rows = _get_table_rows(table)
+            row_idx = rows.index(dpg.get_alias_id(row) if isinstance(row, str) else row)
+            del rows[row_idx + 1 : row_idx + 1 + num_deleted]
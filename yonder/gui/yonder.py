@@ -25,6 +25,7 @@ from yonder.gui.widgets import (
     loading_indicator,
     table_tree_node,
     add_lazy_table_tree_node,
+    clear_table_tree,
     set_foldable_row_status,
     get_foldable_row_descriptor,
     is_row_visible,
@@ -736,7 +737,7 @@ class BanksOfYonder:
         # self.select_node(self._selected_node)
 
     def _regenerate_events_list(self) -> None:
-        dpg.delete_item(f"{self.tag}_events_table", children_only=True, slot=1)
+        clear_table_tree(f"{self.tag}_events_table")
         self.event_map.clear()
 
         all_events = list(self.bnk.query("type=Event"))
@@ -771,7 +772,7 @@ class BanksOfYonder:
         )
 
     def _regenerate_globals_list(self) -> None:
-        dpg.delete_item(f"{self.tag}_globals_table", children_only=True, slot=1)
+        clear_table_tree(f"{self.tag}_globals_table")
         self.globals_map.clear()
 
         global_nodes = [
@@ -1,20 +1,46 @@
-from typing import Any
+from typing import Any, Iterable
 from pathlib import Path
+from functools import lru_cache
+import os
+import pickle
+import logging
+import numpy as np
 
-from yonder.util import resource_data
+try:
+    from numba import njit
+
+    # Our root logger is set to DEBUG, numba is very chatty while compiling
+    logging.getLogger("numba").setLevel(logging.WARNING)
+except ImportError:
+    # Optional, only used to speed up calc_hash
+    njit = None
+
+from yonder.util import logger, resource_dir
 
 
 global_hash_dict: dict[int, str] = {}
+# Reverse of global_hash_dict so known names don't need to be hashed again
+global_name_dict: dict[str, int] = {}
+# Bumped whenever lookup tables are added so cached lookup misses can expire
+_lookup_generation = 0
 
+FNV_BASE = 2166136261
+FNV_PRIME = 16777619
 
-def calc_hash(input: str) -> int:
-    # This is the FNV-1a 32-bit hash taken from rewwise
-    # https://github.com/vswarte/rewwise/blob/127d665ab5393fb7b58f1cade8e13a46f71e3972/analysis/src/fnv.rs#L6
-    FNV_BASE = 2166136261
-    FNV_PRIME = 16777619
+_ASCII_LOWER = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+
+def _encode_lower(input: str) -> bytes:
+    # Wwise names are practically always ascii, which we can lowercase in one go
+    if input.isascii():
+        return input.encode().translate(_ASCII_LOWER)
 
-    input_bytes = input.lower().encode()
+    return input.lower().encode()
 
+
+def _fnv_hash(input_bytes: bytes) -> int:
+    # This is the FNV-1a 32-bit hash taken from rewwise
+    # https://github.com/vswarte/rewwise/blob/127d665ab5393fb7b58f1cade8e13a46f71e3972/analysis/src/fnv.rs#L6
     result = FNV_BASE
     for byte in input_bytes:
         result *= FNV_PRIME
@@ -25,27 +51,161 @@ def calc_hash(input: str) -> int:
     return result
 
 
-def load_lookup_table(path: Path = None) -> dict[int, str]:
-    if not path:
-        pairs = resource_data("wwise_ids.txt").splitlines()
-    else:
-        pairs = [x.strip() for x in path.read_text().splitlines()]
+if njit:
+    _fnv_kernel = njit(cache=True)(_fnv_hash)
+
+    # The same names (busses, events, ...) are hashed over and over again
+    @lru_cache(maxsize=65536)
+    def calc_hash(input: str) -> int:
+        input_bytes = np.frombuffer(_encode_lower(input), dtype=np.uint8)
+        return int(_fnv_kernel(input_bytes))
+
+else:
+
+    @lru_cache(maxsize=65536)
+    def calc_hash(input: str) -> int:
+        return _fnv_hash(_encode_lower(input))
+
+
+# Longer strings are hashed one by one, the bulk buffer grows with the longest string
+_BULK_MAX_LEN = 256
+
+
+def calc_hash_bulk(inputs: Iterable[str]) -> list[int]:
+    """Calculate the hashes of many strings at once.
+
+    Rather than looping over the bytes of every string, this loops over the byte
+    positions and hashes all strings long enough to have a byte there in one go.
+    """
+    inputs = list(inputs)
+    encoded = [_encode_lower(x) for x in inputs]
+    if not encoded:
+        return []
+
+    long_idx = [i for i, b in enumerate(encoded) if len(b) > _BULK_MAX_LEN]
+    if not long_idx:
+        return _fnv_hash_bulk(encoded)
+
+    # A single junk line must not blow up the buffer for everything else
+    long_set = set(long_idx)
+    short_hashes = iter(
+        _fnv_hash_bulk([b for i, b in enumerate(encoded) if i not in long_set])
+    )
+    return [
+        calc_hash(x) if i in long_set else next(short_hashes)
+        for i, x in enumerate(inputs)
+    ]
+
+
+def _fnv_hash_bulk(encoded: list[bytes]) -> list[int]:
+    if not encoded:
+        return []
 
-    table = {}
-    for x in pairs:
-        if x.startswith("#"):
-            continue
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    max_len = int(lengths.max())
 
-        h = calc_hash(x)
-        table[h] = x.strip(" \n")
+    # Sort by length (descending) so the strings still being hashed are always the
+    # first rows of the buffer
+    order = np.argsort(-lengths, kind="stable")
+    buf = np.frombuffer(
+        b"".join(encoded[i].ljust(max_len, b"\0") for i in order), dtype=np.uint8
+    ).reshape(len(encoded), max_len)
+    # Number of strings that still have a byte at each position
+    active = np.searchsorted(-lengths[order], -np.arange(max_len), side="left")
+
+    result = np.full(len(encoded), FNV_BASE, dtype=np.uint32)
+    prime = np.uint32(FNV_PRIME)
+    for col in range(max_len):
+        n = active[col]
+        # uint32 wraps around on overflow, no need to mask
+        result[:n] *= prime
+        result[:n] ^= buf[:n, col]
+
+    hashes = np.empty_like(result)
+    hashes[order] = result
+    return hashes.tolist()
+
+
+def _read_lookup_cache(txt_path: Path) -> dict[int, str]:
+    cache_path = txt_path.with_suffix(".pkl")
+
+    try:
+        if cache_path.stat().st_mtime < txt_path.stat().st_mtime:
+            return None
+
+        with cache_path.open("rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Treat anything we can't unpickle as a stale cache
+        return None
+
+
+def _write_lookup_cache(txt_path: Path, table: dict[int, str]) -> None:
+    # Install dir may be read-only, in which case we just don't cache
+    if not os.access(txt_path.parent, os.W_OK):
+        return
+
+    cache_path = txt_path.with_suffix(".pkl")
+
+    try:
+        with cache_path.open("wb") as f:
+            pickle.dump(table, f, protocol=5)
+    except OSError as e:
+        logger.warning(f"Could not cache lookup table {txt_path}: {e}")
+
+
+def load_lookup_table(path: Path = None) -> dict[int, str]:
+    default_path = resource_dir() / "wwise_ids.txt"
+    txt_path = Path(path) if path else default_path
+
+    # Hashing the entire bundled table takes a while, so we keep a pickled copy
+    # around. User tables are never cached, we don't want to write next to them.
+    use_cache = txt_path.resolve() == default_path.resolve()
+    if use_cache:
+        table = _read_lookup_cache(txt_path)
+        if table is not None:
+            return table
+
+    # Only hash every name once, skipping blank lines and comments
+    keys: dict[str, None] = {}
+    with txt_path.open() as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                keys[line] = None
+
+    hashes = calc_hash_bulk(keys)
+    table = dict(zip(hashes, keys))
+    if use_cache:
+        _write_lookup_cache(txt_path, table)
 
     return table
 
 
-def lookup_name(h: int, default: Any = None) -> str:
-    global global_hash_dict
+def add_lookup_table(table: dict[int, str]) -> None:
+    global _lookup_generation
+    _lookup_generation += 1
+    global_hash_dict.update(table)
+    global_name_dict.update((name, h) for h, name in table.items())
+
+
+def lookup_generation() -> int:
+    """Return a counter that changes whenever a lookup table is added."""
+    return _lookup_generation
 
+
+def lookup_name(h: int, default: Any = None) -> str:
     if not global_hash_dict:
-        global_hash_dict.update(load_lookup_table())
+        add_lookup_table(load_lookup_table())
 
     return global_hash_dict.get(h, default)
+
+
+def lookup_hash(name: str) -> int:
+    """Return the hash of a name, skipping the hash calculation for known names."""
+    # Never load a table here, hashing must work without any lookup tables
+    h = global_name_dict.get(name) if global_name_dict else None
+    if h is None:
+        h = calc_hash(name)
+
+    return h
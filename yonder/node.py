@@ -1,18 +1,151 @@
-from typing import Any, Iterator, Generator, TypeAlias
+from typing import Any, Iterable, Iterator, Generator, TypeAlias
+import sys
 import json
-import copy
 from collections import deque
+from functools import lru_cache
 
-from yonder.hash import calc_hash, lookup_name
-from yonder.util import resource_data, deepmerge
+from yonder.hash import calc_hash_bulk, lookup_name, lookup_hash, lookup_generation
+from yonder.util import resource_data, deepmerge, deepcopy_json
 
 
 _undefined = object()
 NodeLike: TypeAlias = "Node | int | str"
 
 
+@lru_cache(maxsize=1024)
+def _split_path(path: str) -> tuple[str, ...]:
+    # Nodes are accessed through the same handful of paths all the time. Interned keys
+    # let dict lookups succeed on identity more often
+    return tuple(sys.intern(key) for key in path.strip("/").split("/"))
+
+
+@lru_cache(maxsize=1024)
+def _parse_resolve_path(path: str) -> tuple[tuple[str, str | None], ...]:
+    # Split into (key, index) tokens once instead of on every resolve_path call
+    tokens = []
+    for key in _split_path(path):
+        if key not in ("*", "**") and ":" in key:
+            key, idx = key.split(":")
+            tokens.append((sys.intern(key), idx))
+        else:
+            tokens.append((key, None))
+
+    return tuple(tokens)
+
+
+def _bfs_search(
+    data: dict, target_key: str
+) -> Generator[tuple[list[str], dict], None, None]:
+    # Paths are kept as (key, parent) links and only turned into lists for matches
+    queue = deque([(data, None)])
+
+    while queue:
+        current, link = queue.popleft()
+
+        if isinstance(current, dict):
+            if target_key in current:
+                path = []
+                parent = link
+                while parent:
+                    key, parent = parent
+                    path.append(key)
+                path.reverse()
+                yield path, current
+
+            items = current.items()
+        else:
+            items = ((str(i), item) for i, item in enumerate(current))
+
+        for key, value in items:
+            # Leaves can never match, no need to queue them
+            if isinstance(value, (dict, list)):
+                queue.append((value, (key, link)))
+
+
+def _flatten(results: list) -> list[tuple[str, Any]]:
+    flat = []
+    for r in results:
+        if isinstance(r, list):
+            flat.extend(r)
+        elif r:
+            flat.append(r)
+    return flat
+
+
+def _resolve(
+    obj: Any,
+    tokens: tuple[tuple[str, str | None], ...],
+    key_index: int,
+    resolved: list[str],
+    path: str,
+) -> tuple[str, Any] | list[tuple[str, Any]]:
+    if key_index >= len(tokens):
+        return ("/".join(resolved), obj)
+
+    key, idx = tokens[key_index]
+
+    if idx is not None:
+        obj = obj[key]
+
+        if not isinstance(obj, list):
+            raise KeyError(f"{path} resulted in array access on a non-list item")
+
+        if idx == "*":
+            return [
+                _resolve(item, tokens, key_index + 1, resolved + [f"{key}:{i}"], path)
+                for i, item in enumerate(obj)
+            ]
+        else:
+            idx = int(idx)
+            return _resolve(
+                obj[idx], tokens, key_index + 1, resolved + [f"{key}:{idx}"], path
+            )
+
+    elif key == "*":
+        if not isinstance(obj, dict):
+            raise KeyError(f"{path} resulted in '*' being applied on non-dict item")
+
+        results = [
+            _resolve(sub, tokens, key_index + 1, resolved + [k], path)
+            for k, sub in obj.items()
+            if sub
+        ]
+
+        # Combine lists from different branches and filter out empty ones
+        return _flatten(results)
+
+    elif key == "**":
+        if key_index >= len(tokens):
+            raise KeyError(f"'**' can not appear at the end ({path})")
+
+        if not isinstance(obj, dict):
+            raise KeyError(f"{path} resulted in '**' being applied on non-dict item")
+
+        # Search for the unparsed key, i.e. including any array index
+        next_key, next_idx = tokens[key_index + 1]
+        if next_idx is not None:
+            next_key = f"{next_key}:{next_idx}"
+
+        results = [
+            _resolve(sub, tokens, key_index + 1, resolved + bfs_path, path)
+            for bfs_path, sub in _bfs_search(obj, next_key)
+            if sub
+        ]
+
+        # Combine lists from different branches and filter out empty ones
+        return _flatten(results)
+
+    else:
+        return _resolve(obj[key], tokens, key_index + 1, resolved + [key], path)
+
+
 class Node:
+    # Soundbanks can contain tens of thousands of nodes
+    __slots__ = ("_attr", "_type", "_body", "_name_hash", "_lookup_miss")
+
     _templates: dict[str, dict] = {}
+    # Node types by name, filled as subclasses are defined
+    _registry: dict[str, type["Node"]] = {}
 
     @classmethod
     def load_template(cls, name: str) -> dict:
@@ -23,27 +156,55 @@ class Node:
             template_txt = resource_data("templates/" + name + ".json")
             cls._templates[name] = json.loads(template_txt)
 
-        return cls._templates[name]
+        # Parsed only once, but every node needs its own copy
+        return deepcopy_json(cls._templates[name])
 
     @classmethod
     def wrap(cls, node_dict: dict, *args, **kwargs):
         # Make sure the subclasses have been loaded
         import yonder.node_types
 
-        def all_subclasses(c: type) -> dict[str, type]:
-            result = {}
-            for subclass in c.__subclasses__():
-                result[subclass.__name__] = subclass
-                result.update(all_subclasses(subclass))
-            return result
-
         node_type = next(iter(node_dict["body"].keys()))
-        node_cls = all_subclasses(cls).get(node_type, cls)
+        node_cls = Node._registry.get(node_type, cls)
+        if not issubclass(node_cls, cls):
+            node_cls = cls
+
         return node_cls(node_dict, *args, **kwargs)
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Node._registry[cls.__name__] = cls
+
+    @classmethod
+    def resolve_ids(cls, nodes: Iterable["Node"]) -> None:
+        """Resolve the IDs of many nodes at once, hashing their names in bulk."""
+        named = []
+        names = []
+
+        for n in nodes:
+            idsec = n._attr["id"]
+            if idsec.get("Hash"):
+                continue
+
+            # Same check as in id, only names we haven't hashed yet
+            name = idsec["String"]
+            cached = n._name_hash
+            if cached is None or cached[0] != name:
+                named.append(n)
+                names.append(name)
+
+        for n, name, h in zip(named, names, calc_hash_bulk(names)):
+            n._name_hash = (name, h)
+
     def __init__(self, node_dict: dict):
         self._attr = node_dict
         self._type = next(iter(self._attr["body"].keys()))
+        # Accessed on every path lookup
+        self._body: dict = self._attr["body"][self._type]
+        # Hash of the last name we resolved, only valid while the name is unchanged
+        self._name_hash: tuple[str, int] = None
+        # ID for which the name lookup failed last time
+        self._lookup_miss: tuple[int, int] = None
 
     def cast(self) -> "Node":
         return Node.wrap(self._attr)
@@ -55,6 +216,8 @@ class Node:
         # Merge with our attr so that references stay valid and the soundbank's
         # HIRC this node belongs to is updated, too
         deepmerge(self._attr, data, delete_missing=delete_missing)
+        # The body may have been replaced
+        self._body = self._attr["body"][self._type]
 
     @property
     def dict(self) -> dict:
@@ -68,11 +231,19 @@ class Node:
     @property
     def id(self) -> int:
         """ID of a HIRC node (i.e. its hash)."""
+        # Always go through the dict, other wrappers of it may have changed the id
         idsec = self._attr["id"]
         h = idsec.get("Hash")
-        if not h:
-            h = calc_hash(idsec["String"])
+        if h:
+            return h
+
+        name = idsec["String"]
+        cached = self._name_hash
+        if cached is not None and cached[0] == name:
+            return cached[1]
 
+        h = lookup_hash(name)
+        self._name_hash = (name, h)
         return h
 
     @id.setter
@@ -115,10 +286,10 @@ class Node:
     @property
     def body(self) -> dict:
         """Return the body of a node where the relevant attributes are stored."""
-        return self._attr["body"][self.type]
+        return self._body
 
     def copy(self, new_id: int = None, parent: int = None) -> "Node":
-        attr = copy.deepcopy(self._attr)
+        attr = deepcopy_json(self._attr)
         n = Node.wrap(attr)
 
         if new_id is not None:
@@ -131,27 +302,44 @@ class Node:
     def lookup_name(self, default: str = None) -> str:
         name = self._attr["id"].get("String")
         if not name:
-            name = lookup_name(self.id)
+            # Most hashes are not in the lookup table, no need to try again every
+            # time unless new tables have been added since
+            miss = (self.id, lookup_generation())
+            name = None
+            if miss != self._lookup_miss:
+                name = lookup_name(miss[0])
+                if name is None:
+                    self._lookup_miss = miss
 
         if name is None:
             return default
 
         return name
 
-    def paths(self) -> Iterator[str]:
-        def delve(item: dict, path: str):
-            if path:
-                yield path
+    def paths(self, as_tuples: bool = False) -> Iterator[str | tuple[str, ...]]:
+        todo = [(self.body, ())]
 
-            # if isinstance(item, list):
-            #     for idx, value in enumerate(item):
-            #         delve(value, path + f":{idx}")
+        while todo:
+            item, path = todo.pop()
+            if path:
+                yield path if as_tuples else "/" + "/".join(path)
 
             if isinstance(item, dict):
-                for key, value in item.items():
-                    delve(value, path + "/" + key)
+                # Reversed so that the paths come out in their original order
+                todo.extend((value, path + (key,)) for key, value in reversed(item.items()))
 
-        yield from delve(self.body, "")
+    def has_path(self, path: str) -> bool:
+        # Walk the path directly instead of going through get() and its exceptions
+        value = self._body
+        for key in _split_path(path):
+            if not isinstance(value, dict):
+                return False
+
+            value = value.get(key)
+            if value is None:
+                return False
+
+        return True
 
     def get(self, path: str, default: Any = _undefined) -> Any:
         try:
@@ -169,7 +357,7 @@ class Node:
         except KeyError:
             if create:
                 obj: dict = self.body
-                parts = path.strip("/").split("/")
+                parts = _split_path(path)
                 for p in parts[:-1]:
                     obj = obj.setdefault(p, {})
                     if not isinstance(obj, dict):
@@ -177,7 +365,7 @@ class Node:
                             f"Tried to set new path, but {p} already exists"
                         )
 
-                obj[-1] = value
+                obj[parts[-1]] = value
                 return True
 
             return False
@@ -188,101 +376,8 @@ class Node:
         if not path:
             raise ValueError("Empty path")
 
-        parts = path.strip("/").split("/")
-
-        def bfs_search(
-            data: dict, target_key: str
-        ) -> Generator[tuple[list[str], dict], None, None]:
-            queue = deque([(data, [])])
-
-            while queue:
-                current, current_path = queue.popleft()
-
-                if isinstance(current, dict):
-                    if target_key in current:
-                        yield current_path, current
-
-                    for key, value in current.items():
-                        queue.append((value, current_path + [key]))
-
-                elif isinstance(current, list):
-                    for i, item in enumerate(current):
-                        queue.append((item, current_path + [str(i)]))
-
-        def flatten(results: list) -> list[tuple[str, Any]]:
-            flat = []
-            for r in results:
-                if isinstance(r, list):
-                    flat.extend(r)
-                elif r:
-                    flat.append(r)
-            return flat
-
-        def delve(
-            obj: Any, key_index: int, resolved: list[str]
-        ) -> tuple[str, Any] | list[tuple[str, Any]]:
-            if key_index >= len(parts):
-                return ("/".join(resolved), obj)
-
-            key = parts[key_index]
-
-            if key == "*":
-                if not isinstance(obj, dict):
-                    raise KeyError(
-                        f"{path} resulted in '*' being applied on non-dict item"
-                    )
-
-                results = [
-                    delve(sub, key_index + 1, resolved + [k])
-                    for k, sub in obj.items()
-                    if sub
-                ]
-
-                # Combine lists from different branches and filter out empty ones
-                return flatten(results)
-
-            elif key == "**":
-                if key_index >= len(parts):
-                    raise KeyError(f"'**' can not appear at the end ({path})")
-
-                if not isinstance(obj, dict):
-                    raise KeyError(
-                        f"{path} resulted in '**' being applied on non-dict item"
-                    )
-
-                next_key = parts[key_index + 1]
-                results = [
-                    delve(sub, key_index + 1, resolved + bfs_path)
-                    for bfs_path, sub in bfs_search(obj, next_key)
-                    if sub
-                ]
-
-                # Combine lists from different branches and filter out empty ones
-                return flatten(results)
-
-            elif ":" in key:
-                key, idx = key.split(":")
-                obj = obj[key]
-
-                if not isinstance(obj, list):
-                    raise KeyError(
-                        f"{path} resulted in array access on a non-list item"
-                    )
-
-                if idx == "*":
-                    return [
-                        delve(item, key_index + 1, resolved + [f"{key}:{i}"])
-                        for i, item in enumerate(obj)
-                    ]
-                else:
-                    idx = int(idx)
-                    return delve(obj[idx], key_index + 1, resolved + [f"{key}:{idx}"])
-
-            else:
-                return delve(obj[key], key_index + 1, resolved + [key])
-
         try:
-            res = delve(self.body, 0, [])
+            res = _resolve(self.body, _parse_resolve_path(path), 0, [], path)
             if isinstance(res, tuple):
                 res = [res]
             return res
@@ -307,26 +402,23 @@ class Node:
         if not isinstance(item, str):
             return False
 
-        return self.get(item, None) is not None
+        return self.has_path(item)
 
     def __getitem__(self, path: str) -> Any | list[Any]:
         if not path:
             raise ValueError("Empty path")
 
-        # TODO not required anymore when using PathDict
-        parts = path.strip("/").split("/")
-        value = self.body
+        value = self._body
 
-        for key in parts:
+        for key in _split_path(path):
             value = value[key]
 
         return value
 
     def __setitem__(self, path: str, val: Any) -> None:
         try:
-            # TODO not required anymore when using PathDict
-            parts = path.strip("/").split("/")
-            attr = self.body
+            parts = _split_path(path)
+            attr = self._body
 
             for sub in parts[:-1]:
                 attr = attr[sub]
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Iterable
 from yonder import Soundbank, Node
 from yonder.enums import ActionType
 from yonder.util import logger
@@ -9,6 +9,7 @@ class Action(Node):
 
     Actions are triggered by Events and perform operations like playing, stopping, pausing sounds, muting buses, or modifying properties.
     """
+    __slots__ = ()
 
     # Factory methods for different action types
 
@@ -39,11 +40,10 @@ class Action(Node):
 
         action.id = nid
         action.action_type = 1027  # Play action type
-        action.set("params/Play", {})
+        # Written in one go rather than through the property setters
+        action["params"] = {"Play": {"fade_curve": fade_curve, "bank_id": bank_id}}
         action.target_id = target_id
         action.is_bus = False
-        action.fade_curve = fade_curve
-        action.bank_id = bank_id
 
         logger.info(f"Created new node {action}")
         return action
@@ -118,20 +118,17 @@ class Action(Node):
 
         action.id = nid
         action.action_type = 259  # Stop action type
-        action.set(
-            "params/StopEO",
-            {
-                "params/StopEO/stop/flags1": flags1,
-                "params/StopEO/stop/flags2": flags2,
-            },
-            create=True,
-        )
+        action["params"] = {
+            "StopEO": {
+                "stop": {"flags1": flags1, "flags2": flags2},
+                "bank_id": bank_id,
+            }
+        }
 
         action.target_id = target_id
         action.is_bus = False
         if transition_time != 0:
             action.transition_time = transition_time
-        action.bank_id = bank_id
 
         logger.info(f"Created new node {action}")
         return action
@@ -148,15 +145,12 @@ class Action(Node):
 
         action.id = nid
         action.action_type = 4612  # Set state action type
-        action.set(
-            "params/SetState",
-            {
-                "params/SetState/switch_group_id",
-                switch_group_id,
-                "params/SetState/switch_state_id",
-                switch_state_id,
-            },
-        )
+        action["params"] = {
+            "SetState": {
+                "switch_group_id": switch_group_id,
+                "switch_state_id": switch_state_id,
+            }
+        }
 
         logger.info(f"Created new node {action}")
         return action
@@ -192,11 +186,9 @@ class Action(Node):
 
         action.id = nid
         action.action_type = 1538  # Mute bus action type
-        action.set("params/MuteM", {})
+        action["params"] = {"MuteM": {"fade_curve": fade_curve, "bank_id": bank_id}}
         action.target_id = target_bus_id
         action.is_bus = True
-        action.fade_curve = fade_curve
-        action.bank_id = bank_id
 
         logger.info(f"Created new node {action}")
         return action
@@ -241,14 +233,14 @@ class Action(Node):
 
         action.id = nid
         action.action_type = 3330  # Reset bus volume action type
-        action.set("params/ResetBusVolumeM", {})
+        action["params"] = {
+            "ResetBusVolumeM": {"fade_curve": fade_curve, "bank_id": bank_id}
+        }
 
         action.target_id = target_bus_id
         action.is_bus = True
         if transition_time != 0:
             action.transition_time = transition_time
-        action.fade_curve = fade_curve
-        action.bank_id = bank_id
 
         logger.info(f"Created new node {action}")
         return action
@@ -358,9 +350,16 @@ class Action(Node):
 
     @transition_time.setter
     def transition_time(self, value: int) -> None:
-        # Remove existing TransitionTime if present
+        # Update or remove the existing TransitionTime in place
         prop_bundle = self["prop_bundle"]
-        prop_bundle[:] = [p for p in prop_bundle if "TransitionTime" not in p]
+        for i, prop in enumerate(prop_bundle):
+            if "TransitionTime" in prop:
+                if value != 0:
+                    prop["TransitionTime"] = value
+                else:
+                    prop_bundle.pop(i)
+                return
+
         # Add new value if non-zero
         if value != 0:
             prop_bundle.append({"TransitionTime": value})
@@ -381,9 +380,16 @@ class Action(Node):
 
     @delay.setter
     def delay(self, value: int) -> None:
-        # Remove existing delay if present
+        # Update or remove the existing delay in place
         prop_bundle = self["prop_bundle"]
-        prop_bundle[:] = [p for p in prop_bundle if "Delay" not in p]
+        for i, prop in enumerate(prop_bundle):
+            if "Delay" in prop:
+                if value != 0:
+                    prop["Delay"] = value
+                else:
+                    prop_bundle.pop(i)
+                return
+
         # Add new value if non-zero
         if value != 0:
             prop_bundle.append({"Delay": value})
@@ -456,12 +462,27 @@ class Action(Node):
         exception_id : int
             ID of object to exclude from this action.
         """
+        self.add_exceptions([exception_id])
+
+    def add_exceptions(self, exception_ids: Iterable[int]) -> None:
+        """Excludes several objects from this action's effects at once.
+
+        Parameters
+        ----------
+        exception_ids : Iterable[int]
+            IDs of objects to exclude from this action.
+        """
         params = self.params
         if "except" in params:
             exceptions = params["except"]["exceptions"]
-            if exception_id not in exceptions:
-                exceptions.append(exception_id)
-                params["except"]["count"] = len(exceptions)
+            existing = set(exceptions)
+
+            for exception_id in exception_ids:
+                if exception_id not in existing:
+                    exceptions.append(exception_id)
+                    existing.add(exception_id)
+
+            params["except"]["count"] = len(exceptions)
 
     def clear_exceptions(self) -> None:
         """Clears all exceptions, allowing this action to affect all targets."""
@@ -9,6 +9,7 @@ class ActorMixer(ContainerMixin, WwiseNode):
 
     Used to organize audio assets and apply shared processing/routing through the mixer hierarchy.
     """
+    __slots__ = ()
 
     @classmethod
     def new(
@@ -8,6 +8,7 @@ class Bus(RtpcMixin, StateChunkMixin, Node):
 
     Buses serve as mixing points in the audio hierarchy, allowing shared processing (effects, ducking, HDR) and routing to output devices or parent buses. Supports voice ducking and real-time parameter control.
     """
+    __slots__ = ()
     base_params_path = "initial_values"
     
     
@@ -8,6 +8,7 @@ class Event(Node):
 
     Events are the interface between game code and Wwise audio. When the game posts an event, it executes the associated actions (play, stop, etc.).
     """
+    __slots__ = ()
 
     @classmethod
     def new(cls, name: str) -> "Event":
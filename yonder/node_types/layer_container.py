@@ -9,6 +9,7 @@ class LayerContainer(ContainerMixin, WwiseNode):
 
     Useful for layered sound design where different components play together (e.g., engine loop + transmission sounds).
     """
+    __slots__ = ()
 
     @classmethod
     def new(cls, nid: int, parent: int | Node = None) -> "LayerContainer":
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from yonder.util import logger
 
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
 
 
 class ContainerMixin:
+    __slots__ = ()
     children_path: str = "children"
 
 
@@ -29,19 +30,35 @@ class ContainerMixin:
         child_id : int | Node
             Child node ID or Node instance.
         """
-        from yonder.node import Node
-        
-        if isinstance(child_id, Node):
-            if child_id.parent > 0 and child_id.parent != self.id:
-                logger.warning(f"Adding already adopted child {child_id} to {self}")
+        self.add_children([child_id])
 
-            child_id = child_id.id
+    def add_children(self, child_ids: "Iterable[int | Node]") -> None:
+        """Associates several child nodes at once.
+
+        Parameters
+        ----------
+        child_ids : Iterable[int | Node]
+            Child node IDs or Node instances.
+        """
+        from yonder.node import Node
 
         children: list[int] = self[f"{self.children_path}/items"]
-        if child_id not in children:
-            children.append(child_id)
-            self[f"{self.children_path}/count"] = len(children)
-            children.sort()
+        existing = set(children)
+
+        for child_id in child_ids:
+            if isinstance(child_id, Node):
+                if child_id.parent > 0 and child_id.parent != self.id:
+                    logger.warning(f"Adding already adopted child {child_id} to {self}")
+
+                child_id = child_id.id
+
+            if child_id not in existing:
+                children.append(child_id)
+                existing.add(child_id)
+
+        # Only need to sort once
+        self[f"{self.children_path}/count"] = len(children)
+        children.sort()
 
     def remove_child(self, child_id: "int | Node") -> bool:
         """Disassociates a child node from this container.
@@ -6,6 +6,7 @@ if TYPE_CHECKING:
 
 
 class RtpcMixin:
+    __slots__ = ()
     @property
     def rtpcs(self) -> list[dict]:
         """Real-time parameter controls for dynamic audio property adjustments.
@@ -1,5 +1,6 @@
 class StateChunkMixin:
     # TODO build this out a bit more
+    __slots__ = ()
 
     @property
     def state_chunk(self) -> dict:
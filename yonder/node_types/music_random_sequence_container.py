@@ -10,6 +10,7 @@ class MusicRandomSequenceContainer(ContainerMixin, WwiseNode):
 
     Includes transition rules for smooth musical transitions and weighted selection for segments.
     """
+    __slots__ = ()
     base_params_path = "music_trans_node_params/music_node_params/node_base_params"
     children_path = "music_trans_node_params/music_node_params/children"
     
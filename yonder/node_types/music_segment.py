@@ -10,6 +10,7 @@ class MusicSegment(ContainerMixin, WwiseNode):
 
     Contains music tracks and defines the musical structure for adaptive music systems.
     """
+    __slots__ = ()
     base_params_path = "music_node_params/node_base_params"
     children_path = "music_node_params/children"
 
@@ -13,6 +13,7 @@ class MusicSwitchContainer(ContainerMixin, WwiseNode):
     state using a decision tree. Supports complex transition rules between
     segments and multi-dimensional state-based selection.
     """
+    __slots__ = ()
 
     base_params_path = "music_trans_node_params/music_node_params/node_base_params"
     children_path = "music_trans_node_params/music_node_params/children"
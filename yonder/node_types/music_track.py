@@ -16,6 +16,7 @@ class MusicTrack(WwiseNode):
 
     Contains the actual audio sources and defines when/how they play within the segment timeline.
     """
+    __slots__ = ()
 
     @classmethod
     def new(
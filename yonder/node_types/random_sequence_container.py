@@ -9,6 +9,7 @@ class RandomSequenceContainer(ContainerMixin, WwiseNode):
 
     Supports looping, transition timing, and avoiding recent repeats. Used for variations (footsteps, gunshots, voice lines).
     """
+    __slots__ = ()
 
     @classmethod
     def new(
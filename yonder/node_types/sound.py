@@ -15,6 +15,7 @@ class Sound(WwiseNode):
 
     Contains a single audio file (embedded or streamed) with codec settings and 3D positioning parameters.
     """
+    __slots__ = ()
 
     @classmethod
     def new(
@@ -8,6 +8,7 @@ class SwitchContainer(ContainerMixin, WwiseNode):
 
     Switch containers select which child to play based on game state variables (switches). Each switch value maps to a specific child or set of children, enabling dynamic audio selection based on gameplay conditions.
     """
+    __slots__ = ()
 
     @classmethod
     def new(
@@ -1,14 +1,29 @@
+from functools import lru_cache
+
 from yonder.node import Node, NodeLike
 from yonder.enums import VirtualQueueBehavior
 from yonder.util import logger, PathDict
 from .mixins import RtpcMixin, StateChunkMixin
 
 
+@lru_cache
+def _reference_paths(base_params_path: str) -> tuple[str, ...]:
+    # Only a handful of different base paths, no need to build these for every node
+    return (
+        f"{base_params_path}/override_bus_id",
+        f"{base_params_path}/aux_params/aux1",
+        f"{base_params_path}/aux_params/aux2",
+        f"{base_params_path}/aux_params/aux3",
+        f"{base_params_path}/aux_params/aux4",
+    )
+
+
 class WwiseNode(RtpcMixin, StateChunkMixin, Node):
     """Base class for nodes with common node_base_params functionality.
 
     Provides convenient access to shared parameters like aux sends, virtual voice behavior, and state management.
     """
+    __slots__ = ()
     base_params_path = "node_base_params"
 
 
@@ -19,7 +34,8 @@ class WwiseNode(RtpcMixin, StateChunkMixin, Node):
     @property
     def parent(self) -> int:
         """ID of a node's parent node."""
-        return self.base_params["direct_parent_id"]
+        # Hot path, avoid creating a PathDict
+        return self[self.base_params_path + "/direct_parent_id"]
 
     @parent.setter
     def parent(self, value: int | Node) -> None:
@@ -33,7 +49,7 @@ class WwiseNode(RtpcMixin, StateChunkMixin, Node):
         if old_parent > 0 and value > 0 and value != old_parent:
             logger.warning(f"Node {self} is being assigned new parent {value}")
 
-        self.base_params["direct_parent_id"] = value
+        self[self.base_params_path + "/direct_parent_id"] = value
     
     @property
     def properties(self) -> dict[str, float]:
@@ -73,7 +89,12 @@ class WwiseNode(RtpcMixin, StateChunkMixin, Node):
         float
             Property value, or default if not found.
         """
-        return self.properties.get(prop_name, default)
+        node_properties = self[f"{self.base_params_path}/node_initial_params/prop_initial_values"]
+        for prop_dict in node_properties:
+            if prop_name in prop_dict:
+                return prop_dict[prop_name]
+
+        return default
 
     def set_property(self, prop_name: str, value: float) -> None:
         """Set a property value by name.
@@ -97,6 +118,29 @@ class WwiseNode(RtpcMixin, StateChunkMixin, Node):
         # Property doesn't exist, add it
         node_properties.append({prop_name: value})
 
+    def set_properties(self, properties: dict[str, float]) -> None:
+        """Set several property values at once.
+
+        Existing properties are updated, missing ones are added.
+
+        Parameters
+        ----------
+        properties : dict[str, float]
+            Property names and values to set.
+        """
+        node_properties = self[f"{self.base_params_path}/node_initial_params/prop_initial_values"]
+        # Avoid searching the list for every property
+        index = {key: prop_dict for prop_dict in node_properties for key in prop_dict}
+
+        for prop_name, value in properties.items():
+            prop_dict = index.get(prop_name)
+            if prop_dict is not None:
+                prop_dict[prop_name] = value
+            else:
+                prop_dict = {prop_name: value}
+                node_properties.append(prop_dict)
+                index[prop_name] = prop_dict
+
     def remove_property(self, prop_name: str) -> bool:
         """Remove a property by name.
 
@@ -208,14 +252,18 @@ class WwiseNode(RtpcMixin, StateChunkMixin, Node):
     def get_references(self) -> list[int]:
         refs = super().get_references()
 
-        paths = (
-            f"{self.base_params_path}/override_bus_id",
-            f"{self.base_params_path}/aux_params/aux1",
-            f"{self.base_params_path}/aux_params/aux2",
-            f"{self.base_params_path}/aux_params/aux3",
-            f"{self.base_params_path}/aux_params/aux4",
+        # Resolve the base params once instead of walking every path from the top
+        base_params = self.get(self.base_params_path, {})
+        aux_params = base_params.get("aux_params", {})
+        values = (
+            base_params.get("override_bus_id", 0),
+            aux_params.get("aux1", 0),
+            aux_params.get("aux2", 0),
+            aux_params.get("aux3", 0),
+            aux_params.get("aux4", 0),
         )
-        refs.extend([(p, r) for p in paths if (r := self.get(p, 0)) > 0])
+        paths = _reference_paths(self.base_params_path)
+        refs.extend([(p, r) for p, r in zip(paths, values) if r > 0])
 
         for i, (key, val) in enumerate(self.properties.items()):
             if key == "AttenuationID":
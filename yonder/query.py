@@ -1,5 +1,6 @@
 from typing import Iterable, Generator, Callable, TYPE_CHECKING
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import re
 from lark import Lark, Transformer, Token
 from fnmatch import fnmatch
@@ -179,12 +180,38 @@ class _QueryTransformer(Transformer):
         return _NotCondition(self._conds(args)[0])
 
 
+@lru_cache(maxsize=1)
+def _get_parser() -> Lark:
+    # Building the parser means compiling the grammar, only do it once
+    return Lark(lucene_grammar, parser="earley")
+
+
+# Conditions are never modified after parsing, so they can be shared
+@lru_cache(maxsize=256)
 def _parse_query(query_string: str) -> _Condition:
-    parser = Lark(lucene_grammar, parser="earley")
-    tree = parser.parse(query_string)
+    tree = _get_parser().parse(query_string)
     return _QueryTransformer().transform(tree)
 
 
+def _required_type(condition: _Condition) -> str:
+    # The node type every match must have, if the query pins it to a single one
+    if isinstance(condition, _FieldCondition):
+        if condition.field_path == "type" and re.fullmatch(r"\w+", condition.value):
+            return condition.value
+
+    elif isinstance(condition, _OrCondition) and len(condition.conditions) == 1:
+        # The grammar wraps every query in an OR, even without alternatives
+        return _required_type(condition.conditions[0])
+
+    elif isinstance(condition, _AndCondition):
+        for c in condition.conditions:
+            node_type = _required_type(c)
+            if node_type:
+                return node_type
+
+    return None
+
+
 def _match_value(actual_value: str, search_value: str) -> bool:
     if actual_value is None:
         return False
@@ -225,7 +252,14 @@ def query_nodes(
     candidates: Iterable["Node"],
     query: str,
     object_filter: Callable[["Node"], bool] = None,
+    by_type: dict[str, list["Node"]] = None,
 ) -> Generator["Node", None, None]:
+    """Yield all candidates matching the query.
+
+    by_type is an optional index of exactly the given candidates by their lowercase
+    type. If the query requires a specific type, only that type's nodes from the
+    index are checked instead of all candidates.
+    """
     if not query:
         yield from filter(object_filter, candidates)
         return
@@ -234,6 +268,13 @@ def query_nodes(
 
     try:
         condition = _parse_query(query)
+
+        # If the query requires a specific type, only nodes of that type need to be checked
+        if by_type is not None:
+            node_type = _required_type(condition)
+            if node_type:
+                candidates = list(by_type.get(node_type.lower(), ()))
+
         for obj in candidates:
             if object_filter and not object_filter(obj):
                 continue
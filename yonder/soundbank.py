@@ -1,20 +1,61 @@
-from typing import Any, Generator, Iterator
+from typing import Any, Generator, Iterable, Iterator
 from pathlib import Path
-from random import randrange
-from collections import deque
+from random import sample
 import json
-import copy
 import shutil
 import networkx as nx
 
+try:
+    import orjson
+except ImportError:
+    # Optional, only used to speed up loading and saving
+    orjson = None
+
 from yonder.hash import calc_hash
-from yonder.util import logger, resource_data
+from yonder.util import logger, resource_data, deepcopy_json
 from yonder.enums import SourceType
 from yonder.node import Node
 from yonder.query import query_nodes
 
 
+# TODO instead of just taking everything that even remotely looks like an object we really should decide based on node type and attribute name, but.... eh
+_UNRELATED_FIELDS = frozenset(["source_id", "direct_parent_id", "children"])
+
+
+def _int_leaves(body: dict) -> list[int]:
+    """Collect all int values of a node body that could be references to other objects."""
+    leaves = []
+    stack = [body]
+
+    # Children are pushed in reverse so leaves come out in document order
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(
+                val
+                for key, val in reversed(item.items())
+                if key not in _UNRELATED_FIELDS
+            )
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, int):
+            leaves.append(item)
+
+    return leaves
+
+
 class Soundbank:
+    __slots__ = (
+        "bnk_dir",
+        "id",
+        "_json",
+        "_hirc_section",
+        "_hirc",
+        "_id2index",
+        "_id2node",
+        "_by_type",
+    )
+
     @classmethod
     def load(cls, bnk_path: Path | str) -> "Soundbank":
         """Load a soundbank and return a more manageable representation."""
@@ -28,8 +69,11 @@ class Soundbank:
                 bnk_path = bnk_path.parent / bnk_path.stem
             json_path = bnk_path / "soundbank.json"
 
-        with json_path.open() as f:
-            bnk_json: dict = json.load(f)
+        if orjson:
+            bnk_json: dict = orjson.loads(json_path.read_bytes())
+        else:
+            with json_path.open() as f:
+                bnk_json: dict = json.load(f)
 
         # Read the sections
         sections = bnk_json.get("sections", None)
@@ -44,6 +88,8 @@ class Soundbank:
                 bnk_id = body["BKHD"]["bank_id"]
             elif "HIRC" in body:
                 hirc: list[Node] = [Node.wrap(obj) for obj in body["HIRC"]["objects"]]
+                # Events only store their name, hash them all in one go
+                Node.resolve_ids(hirc)
                 cleaned = {n.id: n for n in hirc}
                 if len(cleaned) < len(hirc):
                     logger.warning(
@@ -79,28 +125,81 @@ class Soundbank:
         self.bnk_dir = bnk_dir
         self.id = id
         self._json = json
+        # The json section holding the HIRC objects
+        self._hirc_section: dict = next(
+            (sec["body"]["HIRC"] for sec in json["sections"] if "HIRC" in sec["body"]),
+            None,
+        )
         self._hirc = hirc
 
-        # A helper dict for mapping object IDs to HIRC indices
-        self._id2index: dict[int, int] = {}
+        # Helper dicts for mapping object IDs to HIRC indices and nodes
+        self._id2index: dict[int | str, int] = {}
+        self._id2node: dict[int | str, Node] = {}
+        # Nodes by lowercase type, in HIRC order
+        self._by_type: dict[str, list[Node]] = {}
         self._regenerate_index_table()
 
     def _regenerate_index_table(self):
         self._id2index.clear()
-
-        for idx, node in enumerate(self._hirc):
+        self._id2node.clear()
+        self._by_type.clear()
+        self._index_nodes(0)
+        self._index_types(self._hirc)
+
+    def _index_nodes(self, start: int) -> None:
+        """Add the nodes from start to the end of the HIRC to the index tables."""
+        id2index = self._id2index
+        id2node = self._id2node
+        hirc = self._hirc
+
+        for idx in range(start, len(hirc)):
+            node = hirc[idx]
             idsec = node.dict["id"]
-            if "Hash" in idsec:
-                oid = idsec["Hash"]
-                self._id2index[oid] = idx
-            elif "String" in idsec:
-                eid = idsec["String"]
-                self._id2index[eid] = idx
-                # Events are sometimes referred to by their hash, but it's not included in the json
-                oid = calc_hash(eid)
-                self._id2index[oid] = idx
-            else:
+            oid = idsec.get("Hash")
+            if oid is not None:
+                id2index[oid] = idx
+                id2node[oid] = node
+                continue
+
+            eid = idsec.get("String")
+            if eid is None:
                 logger.error(f"Don't know how to handle object with id {idsec}")
+                continue
+
+            id2index[eid] = idx
+            id2node[eid] = node
+            # Events are sometimes referred to by their hash, but it's not included in the json.
+            # The node caches its hash, so this is usually free
+            id2index[node.id] = idx
+            id2node[node.id] = node
+
+    def _index_types(self, nodes: list[Node]) -> None:
+        """Append nodes to the type index. Must be called in HIRC order."""
+        by_type = self._by_type
+        for node in nodes:
+            key = node.type.lower()
+            bucket = by_type.get(key)
+            if bucket is None:
+                by_type[key] = [node]
+            else:
+                bucket.append(node)
+
+    def _unindex_node(self, node: Node) -> None:
+        """Remove a node from the index tables."""
+        bucket = self._by_type.get(node.type.lower())
+        if bucket:
+            for i, n in enumerate(bucket):
+                if n is node:
+                    del bucket[i]
+                    break
+
+        eid = node.dict["id"].get("String")
+        if eid is not None:
+            self._id2index.pop(eid, None)
+            self._id2node.pop(eid, None)
+
+        self._id2index.pop(node.id, None)
+        self._id2node.pop(node.id, None)
 
     @property
     def name(self) -> str:
@@ -146,21 +245,29 @@ class Soundbank:
 
     def _apply_hirc_to_json(self) -> None:
         """Update this soundbank's json with its current HIRC."""
-        sections = self._json["sections"]
-        for sec in sections:
-            if "HIRC" in sec["body"]:
-                sec["body"]["HIRC"]["objects"] = [n.dict for n in self._hirc]
-                break
+        if self._hirc_section is not None:
+            self._hirc_section["objects"] = [n.dict for n in self._hirc]
 
     def copy(self, name: str, new_bnk_id: int = None) -> "Soundbank":
-        self._apply_hirc_to_json()
+        # The nodes are copied separately, so leave them out of the json copy
+        hirc_body = self._hirc_section
+        if hirc_body is None:
+            bnk_json = deepcopy_json(self._json)
+        else:
+            objects = hirc_body["objects"]
+            hirc_body["objects"] = []
+            try:
+                bnk_json = deepcopy_json(self._json)
+            finally:
+                hirc_body["objects"] = objects
 
         bnk = Soundbank(
             self.bnk_dir.parent / name,
-            copy.deepcopy(self._json),
+            bnk_json,
             self.id,
             [n.copy() for n in self._hirc],
         )
+        bnk._apply_hirc_to_json()
 
         if new_bnk_id is not None:
             bnk.id = new_bnk_id
@@ -192,18 +299,27 @@ class Soundbank:
         if backup and path.is_file():
             shutil.copy(path, str(path) + ".bak")
 
-        with path.open("w") as f:
-            json.dump(self._json, f, indent=2)
+        if orjson:
+            path.write_bytes(orjson.dumps(self._json, option=orjson.OPT_INDENT_2))
+        else:
+            with path.open("w") as f:
+                json.dump(self._json, f, indent=2)
 
         logger.info(f"Saved {self} to {path}, a backup was created")
 
     def new_id(self) -> int:
-        while True:
+        return self.new_ids(1)[0]
+
+    def new_ids(self, num: int) -> list[int]:
+        """Generate num unused IDs which are also distinct from each other."""
+        ids = set()
+        while len(ids) < num:
             # IDs should be signed 32bit integers, although in practice
             # I've rarely seen any below 1000000 (expected I guess?)
-            id = randrange(2**24, 2**31 - 1)
-            if id not in self._id2index:
-                return id
+            candidates = sample(range(2**24, 2**31 - 1), num - len(ids))
+            ids.update(id for id in candidates if id not in self._id2index)
+
+        return list(ids)
 
     def get_insertion_index(self, nodes: list[Node]) -> tuple[int, int]:
         min_idx = 0
@@ -233,38 +349,52 @@ class Soundbank:
         except (KeyError, IndexError):
             return default
 
+    def get_many(self, ids: Iterable[int]) -> list[Node]:
+        """Look up many nodes by their (numeric) IDs at once. Raises a KeyError if any of them don't exist."""
+        id2node = self._id2node
+        return [id2node[nid] for nid in ids]
+
     def add_nodes(self, *nodes: Node) -> None:
+        # Check everything first so we don't end up with half the nodes added
+        new_ids = set()
         for n in nodes:
             if n.id <= 0:
                 raise ValueError(f"Node {n} has invalid ID {n.id}")
-            if n.id in self._id2index:
+            if n.id in self._id2index or n.id in new_ids:
                 raise ValueError(f"Soundbank already contains a node with ID {n.id}")
 
-            self._hirc.append(n)
+            new_ids.add(n.id)
 
-        self._regenerate_index_table()
+        # New nodes are appended, so only they need to be indexed
+        start = len(self._hirc)
+        self._hirc.extend(nodes)
+        self._index_nodes(start)
+        self._index_types(nodes)
 
     def delete_nodes(self, *nodes: int | Node) -> None:
-        abandoned = []
+        abandoned = set()
         for n in nodes:
             if not isinstance(n, Node):
                 n = self[n]
-            abandoned.append(n.id)
+            abandoned.add(n.id)
 
+        # Nodes after the first deleted one will shift, the ones before stay where they are
+        first_idx = min(self._id2index[nid] for nid in abandoned)
         for nid in abandoned:
-            # Don't use `del self[nid]` as it will regenerate the index table on every delete
-            idx = self._id2index[nid]
-            del self._hirc[idx]
+            self._unindex_node(self._id2node[nid])
+
+        self._hirc[first_idx:] = [n for n in self._hirc[first_idx:] if n.id not in abandoned]
+        self._index_nodes(first_idx)
 
         # Search for any nodes referencing the deleted nodes and clear those references
         for node in self._hirc:
-            for path, ref in node.get_references(node):
+            for path, ref in node.get_references():
                 if ref not in abandoned:
                     continue
 
                 # Remove reference from an array
                 if ":" in path.rsplit("/", maxsplit=1)[-1]:
-                    parent_value: list[int] = node[path.rsplit("/", maxsplit=1)[0]]
+                    parent_value: list[int] = node[path.rsplit(":", maxsplit=1)[0]]
                     # Luckily the X_count fields don't matter to rewwise,
                     # otherwise we'd have to update them here, too
                     parent_value.remove(ref)
@@ -272,8 +402,6 @@ class Soundbank:
                     # Unset reference field
                     node[path] = 0
 
-        self._regenerate_index_table()
-
     def delete_orphans(self, cascade: bool = True) -> None:
         g = self.get_full_tree()
         indices = set()
@@ -327,73 +455,97 @@ class Soundbank:
 
     def get_full_tree(self, valid_only: bool = True) -> nx.DiGraph:
         g = nx.DiGraph()
+        id2node = self._id2node
 
         for node in self._hirc:
             g.add_node(node.id, type=node.type)
             references = node.get_references()
             for _, ref in references:
-                if not valid_only or ref in self:
+                if not valid_only or ref in id2node:
                     g.add_edge(node.id, ref)
 
         return g
 
-    def get_subtree(self, entrypoint: int | Node) -> nx.DiGraph:
-        """Collects all descendant nodes from the specified entrypoint in a graph."""
+    def _walk_subtree(
+        self, entrypoint: int | Node
+    ) -> Generator[tuple[int, int, dict], None, None]:
+        """Depth first walk over the hierarchy below entrypoint. Yields the node ID, the ID of the node it was reached from and the node's attributes."""
         if isinstance(entrypoint, int):
             entrypoint = self[entrypoint]
 
-        g = nx.DiGraph()
-        todo = deque([(entrypoint.id, None)])
+        visited = set()
+        todo = [(entrypoint.id, None)]
+
+        # Hoisted out of the loop, this is called for every node of an event's tree
+        hirc = self._hirc
+        id2index = self._id2index
+        todo_pop = todo.pop
+        todo_append = todo.append
 
         # Depth first search to recover all nodes part of the wwise hierarchy
         while todo:
-            node_id, parent_id = todo.pop()
+            node_id, parent_id = todo_pop()
 
-            if node_id in g:
+            if node_id in visited:
                 continue
 
-            idx = self._id2index[node_id]
-            node = self._hirc[idx]
+            visited.add(node_id)
+            idx = id2index[node_id]
+            node = hirc[idx]
             node_type = node.type
-            node_params = node.body
-
-            g.add_node(node_id, index=idx, type=node_type, body=node_params)
-
-            if parent_id is not None:
-                g.add_edge(parent_id, node_id)
+            attr = {"index": idx, "type": node_type, "body": node.body}
 
             if node_type == "Sound":
                 # We found an actual sound
                 wem = node["bank_source_data/media_information/source_id"]
-                g.nodes[node_id]["wems"] = [wem]
+                attr["wems"] = [wem]
             elif node_type == "MusicTrack":
                 wems = [src["source_id"] for src in node["sources"]]
-                g.nodes[node_id]["wems"] = wems
+                attr["wems"] = wems
+
+            yield node_id, parent_id, attr
 
             for _, cid in node.resolve_path("**/children/items:*", []):
-                todo.append((cid, node_id))
+                todo_append((cid, node_id))
 
             ext_id = node.get("external_id", None)
             if ext_id:
-                todo.append((ext_id, node_id))
+                todo_append((ext_id, node_id))
 
             for _, act_id in node.resolve_path("actions:*", []):
-                todo.append((act_id, node_id))
+                todo_append((act_id, node_id))
+
+    def get_subtree(self, entrypoint: int | Node) -> nx.DiGraph:
+        """Collects all descendant nodes from the specified entrypoint in a graph."""
+        g = nx.DiGraph()
+
+        for node_id, parent_id, attr in self._walk_subtree(entrypoint):
+            g.add_node(node_id, **attr)
+            if parent_id is not None:
+                g.add_edge(parent_id, node_id)
 
         return g
 
+    def get_descendants(self, entrypoint: int | Node) -> dict[int, dict]:
+        """Like get_subtree, but returns a plain mapping of node IDs to their attributes for when the graph structure is not needed."""
+        return {
+            node_id: attr for node_id, _, attr in self._walk_subtree(entrypoint)
+        }
+
     def get_parent_chain(self, entrypoint: Node) -> list[int]:
         """Go up in the HIRC from the specified entrypoint and collect all node IDs along the way until we reach the top."""
         parent_id = entrypoint.parent
         upchain = []
+        seen = set()
+        id2node = self._id2node
 
         # Parents are sometimes located in other soundbanks, too
-        while parent_id in self._id2index:
+        while parent_id in id2node:
             # No early exit, we want to recover the entire upwards chain. We'll handle the
             # parts we actually need later
 
             # Check for loops. No clue if that ever happens, but better be safe than sorry
-            if parent_id in upchain:
+            if parent_id in seen:
                 # Print the loop
                 logger.error(f"Reference loop detected: {upchain}")
                 for pid in upchain:
@@ -409,12 +561,13 @@ class Soundbank:
 
             # Children before parents
             upchain.append(parent_id)
-            parent_id = self[parent_id].parent
+            seen.add(parent_id)
+            parent_id = id2node[parent_id].parent
 
         return upchain
 
     def query(self, query: str) -> Generator[Node, None, None]:
-        yield from query_nodes(self._hirc, query)
+        yield from query_nodes(self._hirc, query, by_type=self._by_type)
 
     def query_one(self, query: str, default: Any = None) -> Node:
         return next(self.query(query), default)
@@ -446,40 +599,29 @@ class Soundbank:
     def find_related_objects(self, object_ids: list[int]) -> set[int]:
         """Recursively collect any values of attributes that look like they could be a reference to another object, e.g. a bus."""
         extras = []
+        seen = set()
         object_ids = set(object_ids)  # for efficiency
-
-        # TODO instead of just taking everything that even remotely looks like an object we really should decide based on node type and attribute name, but.... eh
-        def delve(item: Any, field: str, new_ids: set):
-            if field in ["source_id", "direct_parent_id", "children"]:
-                return
-
-            if isinstance(item, list):
-                for i, subnode in enumerate(item):
-                    delve(subnode, f"{field}[{i}]", new_ids)
-
-            elif isinstance(item, dict):
-                for key, val in item.items():
-                    delve(val, key, new_ids)
-
-            elif isinstance(item, int):
-                if item in self._id2index and item not in object_ids:
-                    new_ids.add(item)
+        id2index = self._id2index
+        # Shared by all objects, it's always empty once an object has been processed
+        todo = []
 
         for oid in object_ids:
-            todo = deque([oid])
+            todo.append(oid)
 
             while todo:
                 node_id = todo.pop()
-                node = self._hirc[self._id2index[node_id]]
+                node = self._id2node[node_id]
 
-                new_ids = set()
-                delve(node.body, "body", new_ids)
+                new_ids = {item for item in _int_leaves(node.body) if item in id2index}
+                new_ids -= object_ids
+                new_ids -= seen
 
-                for id in new_ids.difference(extras):
+                for id in new_ids:
                     todo.append(id)
                     # Will contain the highest parents in the beginning (to the left) and deeper
                     # children towards the end (right)
                     extras.append(id)
+                    seen.add(id)
 
         return extras
 
@@ -545,6 +687,8 @@ class Soundbank:
 
         severity = 0
         discovered_ids = set([0])
+        discovered_ids_add = discovered_ids.add
+        id2node = self._id2node
 
         logger.info(f"Verifying {self}...")
 
@@ -559,7 +703,7 @@ class Soundbank:
                 severity = max(severity, 2)
                 continue
 
-            discovered_ids.add(node_id)
+            discovered_ids_add(node_id)
 
             parent_id = node.parent
             if parent_id is not None:
@@ -569,8 +713,7 @@ class Soundbank:
                 elif parent_id in discovered_ids:
                     logger.error(f"{node}: defined after its parent {parent_id}")
                     severity = max(severity, 2)
-                elif parent_id in self:
-                    parent = self[parent_id]
+                elif (parent := id2node.get(parent_id)) is not None:
                     if hasattr(parent, "children"):
                         if node_id not in parent.children:
                             logger.error(
@@ -582,7 +725,7 @@ class Soundbank:
                     severity = max(severity, 2)
 
             for _, ref in node.get_references():
-                if ref in self and ref not in discovered_ids:
+                if ref in id2node and ref not in discovered_ids:
                     logger.error(f"{node}: defined before referenced node {ref}")
                     severity = max(severity, 2)
 
@@ -603,11 +746,12 @@ class Soundbank:
                     # if child_id not in self:
                     #     logger.warning(f"{node}: child {child_id} does not exist")
                     #     severity = max(severity, 1)
-                    if child_id in self:
-                        child = self[child_id]
-                        if child.parent is not None and child.parent != node.id:
+                    child = id2node.get(child_id)
+                    if child is not None:
+                        child_parent = child.parent
+                        if child_parent is not None and child_parent != node_id:
                             logger.error(
-                                f"{node}: child {child_id} has different parent {child.parent}"
+                                f"{node}: child {child_id} has different parent {child_parent}"
                             )
                             severity = max(severity, 2)
 
@@ -623,41 +767,56 @@ class Soundbank:
     def verify_raw(self) -> None:
         # Experimental, treats everything that looks remotely like an ID as a reference,
         # only checks order
+        ignored_keys = {
+            "Hash",
+            "String",
+            "direct_parent_id",
+            "source_id",
+            "in_memory_media_size",
+            "bank_id",
+        }
         discovered_ids = set([0])
+        id2node = self._id2node
+
         for node in self._hirc:
             references = set()
+            todo = [node.body]
 
-            def delve(d: dict) -> None:
-                for k, v in d.items():
-                    if isinstance(v, dict):
-                        delve(v)
-                    elif isinstance(v, list):
-                        sub = {i: s for i, s in enumerate(v)}
-                        delve(sub)
-                    elif k in (
-                        "Hash",
-                        "String",
-                        "direct_parent_id",
-                        "source_id",
-                        "in_memory_media_size",
-                        "bank_id",
+            while todo:
+                item = todo.pop()
+                entries = item.items() if isinstance(item, dict) else enumerate(item)
+
+                for k, v in entries:
+                    if isinstance(v, (dict, list)):
+                        todo.append(v)
+                    # Cheapest check first, most values are not IDs
+                    elif (
+                        isinstance(v, int)
+                        and 10**6 <= v <= 10**10
+                        and k not in ignored_keys
                     ):
-                        continue
-                    elif isinstance(v, int) and 10**6 <= v <= 10**10:
                         references.add(v)
 
-            delve(node.body)
             for ref in references:
-                if ref in self and ref not in discovered_ids:
+                if ref in id2node and ref not in discovered_ids:
                     logger.error(f"{node}: defined before its reference {ref}")
 
+            discovered_ids.add(node.id)
+
     def __iter__(self) -> Iterator[Node]:
         yield from self._hirc
 
     def __contains__(self, key: Any) -> Node:
+        if type(key) is int:
+            # By far the most common case
+            return key in self._id2index
+
         if isinstance(key, Node):
             key = key.id
         elif isinstance(key, str):
+            # Nodes with a String id (i.e. events) are indexed by name, too
+            if key in self._id2index:
+                return True
             key = calc_hash(key)
 
         return key in self._id2index
@@ -667,10 +826,13 @@ class Soundbank:
             if key.startswith("#"):
                 key = int(key[1:])
             else:
+                # Nodes with a String id (i.e. events) are indexed by name, too
+                node = self._id2node.get(key)
+                if node is not None:
+                    return node
                 key = calc_hash(key)
 
-        idx = self._id2index[key]
-        return self._hirc[idx]
+        return self._id2node[key]
 
     def __delitem__(self, key: int | str | Node) -> None:
         if isinstance(key, Node):
@@ -681,10 +843,12 @@ class Soundbank:
             else:
                 key = calc_hash(key)
 
-        idx = self._id2index.pop(key)
+        idx = self._id2index[key]
+        self._unindex_node(self._hirc[idx])
         del self._hirc[idx]
 
-        self._regenerate_index_table()
+        # Only the nodes after the deleted one have moved
+        self._index_nodes(idx)
 
     def __str__(self):
         return f"Soundbank (id={self.id}, bnk={self.name})"
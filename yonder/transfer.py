@@ -1,3 +1,7 @@
+from bisect import bisect_left
+import os
+import logging
+
 from yonder import Soundbank, Node
 from yonder.node_types import Event, Action
 from yonder.wem import import_wems
@@ -8,16 +12,17 @@ def extract_structure(bnk: Soundbank, entrypoint) -> list[Node]:
     nodes = []
 
     # Collect the hierarchy responsible for playing the sound(s)
-    action_tree = bnk.get_subtree(entrypoint)
-    nodes.extend(bnk[n] for n in action_tree.nodes)
+    action_tree = bnk.get_descendants(entrypoint)
+    nodes.extend(bnk.get_many(action_tree))
 
     # Go upwards through the parents chain and see what needs to be transferred
     upchain = bnk.get_parent_chain(entrypoint)
-    nodes.extend((bnk[uid] for uid in upchain))
+    nodes.extend(bnk.get_many(upchain))
 
     # Collect additional referenced items
-    extras = bnk.find_related_objects(action_tree.nodes)
-    nodes.extend(bnk[eid] for eid in extras if eid in bnk)
+    extras = bnk.find_related_objects(action_tree)
+    # Only IDs from this soundbank are collected
+    nodes.extend(bnk.get_many(extras))
 
     return nodes
 
@@ -28,15 +33,14 @@ def copy_event(
     event: Event,
 ) -> Event:
     event = event.copy()
-    actions = [src_bnk[aid].copy() for aid in event["actions"]]
+    actions: list[Action] = [src_bnk[aid].copy() for aid in event["actions"]]
 
     # Some actions make references to other soundbanks
+    src_id = src_bnk.id
     for a in actions:
-        # Look for e.g. params/Play/bank_id
-        for params in a.get("params", {}).values():
-            action_bank_id = params.get("bank_id", None)
-            if action_bank_id == src_bnk.id:
-                params["bank_id"] = dst_bnk.id
+        # Actions have a single params dict, e.g. params/Play/bank_id
+        if a.bank_id == src_id:
+            a.bank_id = dst_bnk.id
 
     dst_bnk.add_nodes(event, *actions)
     return event
@@ -49,23 +53,32 @@ def copy_node_structure(
 ) -> list[tuple[int, str]]:
     # Collect the hierarchy responsible for playing the sound(s)
     action_tree = src_bnk.get_subtree(entrypoint)
-    tree_str = format_hierarchy(src_bnk, action_tree)
-    logger.info(f"Hierarchy for node {entrypoint}:\n{tree_str}\n")
+    # Building the log messages walks the trees again, skip it if nobody is listening
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        tree_str = format_hierarchy(src_bnk, action_tree)
+        logger.info(f"Hierarchy for node {entrypoint}:\n{tree_str}\n")
 
     wems = []
-    # MusicTrack nodes can have multiple sources
+    # Everything is added to dst_bnk in one go at the end
+    to_add = []
+
+    # Copy the nodes and collect their wems in the same pass
     for nid, n_wems in action_tree.nodes.data("wems"):
+        to_add.append(src_bnk[nid].copy())
+        # MusicTrack nodes can have multiple sources
         if n_wems:
             wems.extend((nid, w) for w in n_wems)
 
-    dst_bnk.add_nodes(*[src_bnk[n].copy() for n in action_tree.nodes])
-
     # Go upwards through the parents chain and see what needs to be transferred
     upchain = src_bnk.get_parent_chain(entrypoint)
-    upchain_str = "\n".join(
-        [f" ⤷ {up_id} ({src_bnk[up_id].type})" for up_id in reversed(upchain)]
-    )
-    logger.info(f"\nThe parent chain consists of the following nodes:\n{upchain_str}\n")
+    if log_info:
+        upchain_str = "\n".join(
+            [f" ⤷ {up_id} ({src_bnk[up_id].type})" for up_id in reversed(upchain)]
+        )
+        logger.info(
+            f"\nThe parent chain consists of the following nodes:\n{upchain_str}\n"
+        )
 
     up_child = entrypoint
     for up_id in upchain:
@@ -75,10 +88,11 @@ def copy_node_structure(
             up_node = dst_bnk[up_id]
             items = up_node["children/items"]
 
-            if up_child.id not in items:
-                items.append(up_child.id)
+            # Children are kept sorted
+            idx = bisect_left(items, up_child.id)
+            if idx == len(items) or items[idx] != up_child.id:
+                items.insert(idx, up_child.id)
                 up_child.parent = up_node.id
-                items.sort()
 
             break
 
@@ -86,23 +100,25 @@ def copy_node_structure(
         # will make the soundbank invalid
         up = src_bnk[up_id].copy()
         up["children/items"] = []
-        dst_bnk.add_nodes(up)
+        to_add.append(up)
 
         up_child = up
 
     # Collect additional referenced items
     extras = src_bnk.find_related_objects(action_tree.nodes)
-    extras_str = "\n".join([f" - {nid} ({src_bnk[nid].type})" for nid in extras])
-    logger.info(f"\nThe following extra items were collected:\n{extras_str}\n")
-
-    for oid in extras:
-        if oid not in src_bnk:
-            continue
-
-        if oid in dst_bnk:
-            continue
+    if log_info:
+        extras_str = "\n".join([f" - {nid} ({src_bnk[nid].type})" for nid in extras])
+        logger.info(f"\nThe following extra items were collected:\n{extras_str}\n")
+
+    # Extras may include parents we're already adding
+    adding = {n.id for n in to_add}
+    to_add.extend(
+        n.copy()
+        for n in src_bnk.get_many(extras)
+        if n.id not in dst_bnk and n.id not in adding
+    )
 
-        dst_bnk.add_nodes(src_bnk[oid].copy())
+    dst_bnk.add_nodes(*to_add)
 
     return wems
 
@@ -116,11 +132,21 @@ def copy_wems(
     logger.info(f"Discovered the following WEMs:\n{wems_str}\n")
 
     logger.info("Copying wems...")
+    # One directory listing instead of checking every file separately
+    try:
+        with os.scandir(src_bnk.bnk_dir) as it:
+            available = {
+                e.name for e in it if e.name.endswith(".wem") and e.is_file()
+            }
+    except FileNotFoundError:
+        # Nothing unpacked yet, every wem will be reported as missing
+        available = set()
+
     wem_paths = []
     for nid, wem in wems:
-        wp = src_bnk.bnk_dir / f"{wem}.wem"
-        if wp.is_file():
-            wem_paths.append(wp)
+        wem_name = f"{wem}.wem"
+        if wem_name in available:
+            wem_paths.append(src_bnk.bnk_dir / wem_name)
         else:
             sound = src_bnk[nid]
             plugin = sound["bank_source_data/plugin"]
@@ -136,6 +162,7 @@ def copy_wwise_events(
     src_bnk: Soundbank,
     dst_bnk: Soundbank,
     wwise_map: dict[int | str, str],
+    verify: bool = False,
 ) -> None:
     wems = []
 
@@ -162,13 +189,14 @@ def copy_wwise_events(
             new_wems = copy_node_structure(src_bnk, dst_bnk, entrypoint)
             wems.extend(w for _, w in new_wems)
 
-    # Verify
-    logger.info("\nVerifying soundbank...")
-    severity = dst_bnk.verify()
-    if severity > 0:
-        logger.warning(" - some issues were found in your soundbank. Check the log!")
-    else:
-        logger.info(" - seems surprisingly fine :o\n")
+    # Saving verifies the soundbank anyway
+    if verify:
+        logger.info("\nVerifying soundbank...")
+        severity = dst_bnk.verify()
+        if severity > 0:
+            logger.warning(" - some issues were found in your soundbank. Check the log!")
+        else:
+            logger.info(" - seems surprisingly fine :o\n")
 
     # Copy WEMs
     copy_wems(src_bnk, dst_bnk, wems)
@@ -181,6 +209,7 @@ def copy_structures_with_new_events(
     src_bnk: Soundbank,
     dst_bnk: Soundbank,
     nodes: dict[Node, str],
+    verify: bool = False,
 ) -> None:
     wems = []
 
@@ -201,14 +230,14 @@ def copy_structures_with_new_events(
         new_wems = copy_node_structure(src_bnk, dst_bnk, entrypoint)
         wems.extend(w for _, w in new_wems)
 
-    # Verify
-    logger.info("\nVerifying soundbank...")
-    issues = dst_bnk.verify()
-    if issues:
-        for issue in issues:
-            logger.warning(f" - {issue}")
-    else:
-        logger.info(" - seems surprisingly fine :o\n")
+    # Saving verifies the soundbank anyway
+    if verify:
+        logger.info("\nVerifying soundbank...")
+        severity = dst_bnk.verify()
+        if severity > 0:
+            logger.warning(" - some issues were found in your soundbank. Check the log!")
+        else:
+            logger.info(" - seems surprisingly fine :o\n")
 
     # Copy WEMs
     copy_wems(src_bnk, dst_bnk, wems)
@@ -12,6 +12,12 @@ import subprocess
 import shutil
 import networkx as nx
 
+try:
+    import orjson
+except ImportError:
+    # Optional, only used to speed up copying json data
+    orjson = None
+
 from yonder.enums import SoundType
 
 if TYPE_CHECKING:
@@ -147,31 +153,51 @@ def get_function_spec(
 
 
 def deepmerge(base: dict, updates: dict, delete_missing: bool = False) -> None:
-    def merge(target: dict, source: Any) -> Any:
+    # Iterative to avoid deep recursion on large nodes
+    todo = [(base, updates)]
+
+    while todo:
+        target, source = todo.pop()
+
         if isinstance(target, dict) and isinstance(source, dict):
             if delete_missing:
-                keys_to_remove = set(target.keys()) - set(source.keys())
-                for key in keys_to_remove:
+                for key in target.keys() - source.keys():
                     del target[key]
+
             for key, value in source.items():
-                if (
-                    key in target
-                    and isinstance(target[key], (dict, list))
-                    and isinstance(value, (dict, list))
-                ):
-                    target[key] = merge(target[key], value)
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    todo.append((current, value))
+                elif isinstance(current, list) and isinstance(value, list):
+                    # Update lists in place so that references to them stay valid
+                    current[:] = value
                 else:
                     target[key] = value
+
         elif isinstance(target, list) and isinstance(source, list):
-            target.clear()
-            target.extend(source)
-        else:
-            # Caller will assign the return value
-            return source
+            target[:] = source
+
+
+def _copy_containers(obj: Any) -> Any:
+    t = type(obj)
+    if t is dict:
+        return {k: _copy_containers(v) for k, v in obj.items()}
+    if t is list:
+        return [_copy_containers(v) for v in obj]
+    return obj
+
 
-        return target
+def deepcopy_json(obj: Any) -> Any:
+    # Much faster than copy.deepcopy, json data only needs its containers copied
+    if orjson:
+        # Roundtripping through orjson beats copying the containers in python
+        try:
+            return orjson.loads(orjson.dumps(obj))
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bit
+            pass
 
-    merge(base, updates)
+    return _copy_containers(obj)
 
 
 class PathDict(MutableMapping):
@@ -6,13 +6,20 @@ import subprocess
 # NOTE need to manually install audioop-lts
 from pydub import AudioSegment, silence
 
-from yonder import Soundbank
+from yonder import Soundbank, Node
 from yonder.util import logger
 
 
 def import_wems(bnk: Soundbank, wems: list[Path]) -> None:
+    # FIXME need to find source_ids in MusicTracks and possibly other nodes as well
+    # Collect the sounds once instead of querying them again for every wem
+    sounds_by_source: dict[int, list[Node]] = {}
+    for node in bnk.query("type=Sound"):
+        source_id = node.get("bank_source_data/media_information/source_id", None)
+        sounds_by_source.setdefault(source_id, []).append(node)
+
     for wem in wems:
-        if not wem.endswith(".wem"):
+        if not wem.name.endswith(".wem"):
             continue
 
         # We allow adding additional info to the wem filename to make them easier to handle
@@ -30,15 +37,8 @@ def import_wems(bnk: Soundbank, wems: list[Path]) -> None:
         target_path = bnk.bnk_dir / f"{wem_id}.wem"
         shutil.copy(wem, target_path)
 
-        # FIXME need to find source_ids in MusicTracks and possibly other nodes as well
-        sound_nodes = list(
-            bnk.query(
-                f"type=Sound bank_source_data/media_information/source_id={wem_id}"
-            )
-        )
-
         wem_size = target_path.stat().st_size
-        for node in sound_nodes:
+        for node in sounds_by_source.get(wem_id, ()):
             node["bank_source_data/media_information/in_memory_media_size"] = wem_size
 
 